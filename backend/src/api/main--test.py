@@ -67,3 +67,27 @@ class TestMainAPI:
 
         # If there were an error, it should return proper JSON error format
         # The actual error handling is tested in optimize--test.py
+
+    def test_oversized_upload_rejected_before_body(self):
+        """Test uploads are rejected from Content-Length alone."""
+        # Only the header is oversized; the middleware must not need the body
+        response = client.post(
+            "/optimize/",
+            content=b"",
+            headers={"content-length": str(30 * 1024 * 1024)},
+        )
+
+        assert response.status_code == 413
+        assert "File too large" in response.json()["error"]
+
+    def test_upload_at_file_limit_passes_middleware(self):
+        """Test multipart overhead on a file just under the limit isn't a 413."""
+        from .optimize import MAX_FILE_SIZE_BYTES
+
+        response = client.post(
+            "/optimize/",
+            content=b"",
+            headers={"content-length": str(MAX_FILE_SIZE_BYTES + 1024)},
+        )
+
+        assert response.status_code != 413
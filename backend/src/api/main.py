@@ -13,6 +13,7 @@ logging.basicConfig(
 )
 
 from .auth import router as auth_router
+from .optimize import MAX_REQUEST_OVERHEAD_BYTES, check_file_size
 from .optimize import router as optimize_router
 
 app = FastAPI(
@@ -52,6 +53,32 @@ def get_cors_origins():
     return origins
 
 
+class UploadSizeLimitMiddleware:
+    """Reject oversized uploads from Content-Length before the body is read."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    # The request body bounds the file size; the exact per-file
+                    # check happens in _validate_upload_file
+                    try:
+                        if value.isdigit():
+                            check_file_size(int(value) - MAX_REQUEST_OVERHEAD_BYTES)
+                    except HTTPException as exc:
+                        response = await http_exception_handler(None, exc)
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+# Added before CORS so CORS wraps it and 413 responses still carry CORS headers
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Add CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
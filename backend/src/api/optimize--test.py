@@ -1,3 +1,4 @@
+import asyncio
 import io
 import json
 import tempfile
@@ -5,6 +6,7 @@ import time
 import zipfile
 from pathlib import Path
 
+import httpx
 from fastapi.testclient import TestClient
 from PIL import Image
 
@@ -12,6 +14,39 @@ from .main import app
 
 client = TestClient(app)
 
+# Metadata fields every instagram_square upload of "test.jpg" must carry
+EXPECTED_META = {"preset": "instagram_square", "original_file": "test.jpg"}
+
+# Constant upload bodies; httpx accepts raw bytes for multipart files
+_CORRUPTED_JPEG_BYTES = b"INVALID_IMAGE_DATA"
+_TXT_BYTES = b"This is not an image"
+
+# Fastest encoder settings per format; fixture fidelity is irrelevant
+_SAVE_KW = {
+    "JPEG": {"quality": 75, "optimize": False, "progressive": False},
+    "PNG": {"compress_level": 1},
+    "WebP": {"quality": 75, "method": 0},
+}
+
+
+def _is_zip(response) -> bool:
+    """Check the ZIP local-file-header signature."""
+    return response.content[:2] == b"PK"
+
+
+def _is_jpeg(response) -> bool:
+    """Check the JPEG start-of-image marker."""
+    return response.content[:2] == b"\xff\xd8"
+
+
+def _is_webp(response) -> bool:
+    """Check the RIFF container signature used by WebP."""
+    return response.content[:4] == b"RIFF"
+
+
+# Scratch buffer reused by create_test_image to avoid regrowing on every encode
+_ENCODE_BUFFER = io.BytesIO()
+
 
 class TestOptimizeAPI:
     """Test the image optimization API endpoints."""
@@ -19,10 +54,11 @@ class TestOptimizeAPI:
     def create_test_image(self, size=(1000, 800), format="JPEG", mode="RGB"):
         """Create a test image for upload testing."""
         image = Image.new(mode, size, color=(255, 128, 64))
-        buffer = io.BytesIO()
-        image.save(buffer, format=format)
-        buffer.seek(0)
-        return buffer
+        _ENCODE_BUFFER.seek(0)
+        _ENCODE_BUFFER.truncate()
+        image.save(_ENCODE_BUFFER, format=format, **_SAVE_KW.get(format, {}))
+        # Hand out an independent copy so callers never share the scratch buffer
+        return io.BytesIO(_ENCODE_BUFFER.getvalue())
 
     def test_get_processors_endpoint(self):
         """Test getting available processors."""
@@ -51,6 +87,7 @@ class TestOptimizeAPI:
 
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/zip"
+        assert _is_zip(response)
         assert "pixelprep_instagram_square.zip" in response.headers.get(
             "content-disposition", ""
         )
@@ -71,8 +108,7 @@ class TestOptimizeAPI:
 
             # Verify metadata content
             metadata = json.loads(zip_file.read("metadata.json"))
-            assert metadata["preset"] == "instagram_square"
-            assert metadata["original_file"] == "test.jpg"
+            assert EXPECTED_META.items() <= metadata.items()
             assert "processor_config" in metadata
 
     def test_optimize_invalid_preset(self):
@@ -91,10 +127,8 @@ class TestOptimizeAPI:
 
     def test_optimize_unsupported_format(self):
         """Test optimization with unsupported file format."""
-        # Create a text file pretending to be an image
-        text_buffer = io.BytesIO(b"This is not an image")
-
-        files = {"file": ("test.txt", text_buffer, "text/plain")}
+        # Upload a text file pretending to be an image
+        files = {"file": ("test.txt", _TXT_BYTES, "text/plain")}
         data = {"preset": "instagram_square"}
 
         response = client.post("/optimize/", files=files, data=data)
@@ -118,10 +152,7 @@ class TestOptimizeAPI:
 
     def test_optimize_corrupted_image(self):
         """Test optimization with corrupted image data."""
-        # Create invalid image data
-        corrupted_buffer = io.BytesIO(b"INVALID_IMAGE_DATA")
-
-        files = {"file": ("corrupted.jpg", corrupted_buffer, "image/jpeg")}
+        files = {"file": ("corrupted.jpg", _CORRUPTED_JPEG_BYTES, "image/jpeg")}
         data = {"preset": "instagram_square"}
 
         response = client.post("/optimize/", files=files, data=data)
@@ -167,7 +198,7 @@ class TestOptimizeAPI:
             response = client.post("/optimize/", files=files, data=data)
 
             assert response.status_code == 200, f"Failed for format {pil_format}"
-            assert response.headers["content-type"] == "application/zip"
+            assert _is_zip(response)
 
     def test_optimize_rgba_to_rgb_conversion(self):
         """Test that RGBA images are properly converted to RGB."""
@@ -220,6 +251,7 @@ class TestOptimizeAPI:
 
         assert response.status_code == 200
         assert response.headers["content-type"] == "image/jpeg"
+        assert _is_jpeg(response)
         assert "test_instagram_square.jpg" in response.headers.get(
             "content-disposition", ""
         )
@@ -261,8 +293,7 @@ class TestOptimizeAPI:
             assert "metadata.json" in files_in_zip
 
             metadata = json.loads(zip_file.read("metadata.json"))
-            assert metadata["preset"] == "instagram_square"
-            assert metadata["original_file"] == "test.jpg"
+            assert EXPECTED_META.items() <= metadata.items()
 
     def test_optimize_format_parameter_default(self):
         """Test that format parameter defaults to 'zip' when not specified."""
@@ -274,7 +305,7 @@ class TestOptimizeAPI:
         response = client.post("/optimize/", files=files, data=data)
 
         assert response.status_code == 200
-        assert response.headers["content-type"] == "application/zip"
+        assert _is_zip(response)
 
     def test_optimize_web_display_image_format(self):
         """Test web_display preset returns WebP format when format=image."""
@@ -299,7 +330,100 @@ class TestOptimizeAPI:
         else:
             assert ".jpg" in content_disposition
 
-    def test_optimize_all_presets_both_formats(self):
+    def test_optimize_batch_presets(self):
+        """Test one upload processed with several presets returns one ZIP."""
+        image_buffer = self.create_test_image(size=(2000, 1500))
+
+        files = {"file": ("test.jpg", image_buffer, "image/jpeg")}
+        data = {"presets": ["instagram_square", "email_newsletter", "instagram_square"]}
+
+        response = client.post("/optimize/batch", files=files, data=data)
+
+        assert response.status_code == 200
+        assert _is_zip(response)
+        assert response.headers["x-presets"] == "instagram_square,email_newsletter"
+
+        with zipfile.ZipFile(io.BytesIO(response.content), "r") as zip_file:
+            assert zip_file.namelist() == [
+                "test_instagram_square.jpg",
+                "test_email_newsletter.jpg",
+                "metadata.json",
+            ]
+            metadata = json.loads(zip_file.read("metadata.json"))
+            assert metadata["presets"] == ["instagram_square", "email_newsletter"]
+            square = metadata["optimizations"]["instagram_square"]["metadata"]
+            assert square["dimensions"] == "1080x1080"
+
+    def test_optimize_batch_matches_single_presets(self):
+        """Test each batch output equals the single-preset endpoint's output."""
+        image_buffer = self.create_test_image(size=(2000, 1500))
+        content = image_buffer.getvalue()
+        presets = ["jury_submission", "quick_compress", "email_newsletter"]
+
+        files = {"file": ("test.jpg", content, "image/jpeg")}
+        response = client.post(
+            "/optimize/batch", files=files, data={"presets": presets}
+        )
+        assert response.status_code == 200
+
+        with zipfile.ZipFile(io.BytesIO(response.content), "r") as zip_file:
+            for preset in presets:
+                files = {"file": ("test.jpg", content, "image/jpeg")}
+                single = client.post(
+                    "/optimize/?format=image", files=files, data={"preset": preset}
+                )
+                assert single.status_code == 200
+                assert zip_file.read(f"test_{preset}.jpg") == single.content
+
+    async def test_optimize_batch_stores_original_dimensions(self, monkeypatch):
+        """Test an authenticated batch stores the upload's size, not the decode size."""
+        from types import SimpleNamespace
+
+        from . import optimize as optimize_api
+
+        stored = {}
+
+        class FakeStorage:
+            def __init__(self, user_id):
+                pass
+
+            def store_original_image_bytes(self, content, filename, metadata):
+                stored["original"] = metadata
+                return {"success": True, "image_id": "image-1"}
+
+            def store_optimized_image_bytes(self, *args, **kwargs):
+                return {"success": True, "optimization_id": "optimization-1"}
+
+        monkeypatch.setattr(optimize_api, "PersistentStorage", FakeStorage)
+        content = self.create_test_image(size=(6000, 4000)).getvalue()
+
+        results = await optimize_api._process_image_batch(
+            content,
+            "large.jpg",
+            ["instagram_square", "email_newsletter"],
+            SimpleNamespace(id="user-1"),
+        )
+
+        assert len(results) == 2
+        assert stored["original"] == {
+            "dimensions": "6000x4000",
+            "format": "JPEG",
+            "mode": "RGB",
+        }
+
+    def test_optimize_batch_invalid_preset(self):
+        """Test batch optimization rejects unknown presets."""
+        image_buffer = self.create_test_image()
+
+        files = {"file": ("test.jpg", image_buffer, "image/jpeg")}
+        data = {"presets": ["instagram_square", "invalid_preset"]}
+
+        response = client.post("/optimize/batch", files=files, data=data)
+
+        assert response.status_code == 400
+        assert "invalid_preset" in response.json()["error"]
+
+    async def test_optimize_all_presets_both_formats(self):
         """Test all presets work with both image and zip formats."""
         presets = [
             "instagram_square",
@@ -309,27 +433,42 @@ class TestOptimizeAPI:
             "quick_compress",
         ]
         formats = ["image", "zip"]
+        requests = [
+            (preset, format_type) for preset in presets for format_type in formats
+        ]
 
-        for preset in presets:
-            for format_type in formats:
-                image_buffer = self.create_test_image(size=(1200, 800))
-
-                files = {"file": ("test.jpg", image_buffer, "image/jpeg")}
-                data = {"preset": preset}
-
-                response = client.post(
-                    f"/optimize/?format={format_type}", files=files, data=data
-                )
-
-                assert response.status_code == 200, (
-                    f"Failed for preset {preset} with format {format_type}"
-                )
-
-                if format_type == "image":
-                    assert response.headers["content-type"].startswith("image/")
-                    assert response.headers.get("X-Preset") == preset
-                else:
-                    assert response.headers["content-type"] == "application/zip"
+        # Dispatch the whole matrix concurrently so independent encodes overlap
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as async_client:
+            responses = await asyncio.gather(
+                *[
+                    async_client.post(
+                        f"/optimize/?format={format_type}",
+                        files={
+                            "file": (
+                                "test.jpg",
+                                self.create_test_image(size=(1200, 800)),
+                                "image/jpeg",
+                            )
+                        },
+                        data={"preset": preset},
+                    )
+                    for preset, format_type in requests
+                ]
+            )
+
+        for (preset, format_type), response in zip(requests, responses, strict=True):
+            assert response.status_code == 200, (
+                f"Failed for preset {preset} with format {format_type}"
+            )
+
+            if format_type == "image":
+                assert _is_jpeg(response) or _is_webp(response)
+                assert response.headers.get("X-Preset") == preset
+            else:
+                assert _is_zip(response)
 
     def test_temporary_file_cleanup(self):
         """Test that temporary files are properly cleaned up after processing."""
@@ -386,9 +525,7 @@ class TestOptimizeAPI:
             initial_temp_files.update(temp_path.glob(pattern))
 
         # Try to process a corrupted image (should fail but clean up temp files)
-        corrupted_buffer = io.BytesIO(b"INVALID_IMAGE_DATA")
-
-        files = {"file": ("corrupted.jpg", corrupted_buffer, "image/jpeg")}
+        files = {"file": ("corrupted.jpg", _CORRUPTED_JPEG_BYTES, "image/jpeg")}
         data = {"preset": "instagram_square"}
 
         response = client.post("/optimize/", files=files, data=data)
@@ -1,13 +1,25 @@
+import asyncio
 import io
+import json
 import logging
-import tempfile
+import os
 import zipfile
-from pathlib import Path
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
-from fastapi.responses import StreamingResponse
-from PIL import Image, UnidentifiedImageError
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from PIL import Image, UnidentifiedImageError, features
 
 # Set up logging for API level file size tracking
 logger = logging.getLogger(__name__)
@@ -21,7 +33,7 @@ router = APIRouter(prefix="/optimize", tags=["optimization"])
 
 # Available processors
 from ..processors.compress import QuickCompressProcessor
-from ..processors.custom import create_custom_processor
+from ..processors.custom import CustomProcessor, create_custom_processor
 from ..processors.email import EmailNewsletterProcessor
 from ..processors.jury import JurySubmissionProcessor
 from ..processors.web import WebDisplayProcessor
@@ -34,8 +46,52 @@ PROCESSORS = {
     "quick_compress": QuickCompressProcessor(),
 }
 
-SUPPORTED_FORMATS = {".jpg", ".jpeg", ".png", ".webp", ".tiff", ".bmp"}
+# Preset configs are static per processor, so build them once at import time.
+# Copied into plain dicts since some processors return read-only mappings,
+# which json.dumps can't serialize
+PROCESSOR_CONFIGS = {
+    processor_id: dict(processor.get_preset_config())
+    for processor_id, processor in PROCESSORS.items()
+}
+
+SUPPORTED_FORMATS = frozenset({".jpg", ".jpeg", ".png", ".webp", ".tiff", ".bmp"})
+SUPPORTED_FORMATS_LIST = sorted(SUPPORTED_FORMATS)
 MAX_FILE_SIZE_MB = 25
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+# Content-Length also counts multipart boundaries and form fields; requests may
+# exceed the file limit by this much before the per-file check reads the body
+MAX_REQUEST_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Output file extension and media type per encoded format
+OUTPUT_EXTENSIONS = {"JPEG": "jpg", "WEBP": "webp", "PNG": "png"}
+OUTPUT_MEDIA_TYPES = {"jpg": "image/jpeg", "webp": "image/webp", "png": "image/png"}
+
+# Feature flags are read once at import, so the /processors payload is static too
+_PROCESSORS_INFO = dict(PROCESSOR_CONFIGS)
+if CUSTOM_PRESETS_ENABLED:
+    # Default custom processor instance for metadata
+    _PROCESSORS_INFO["custom"] = CustomProcessor().get_preset_config()
+PROCESSORS_INFO_RESPONSE = {
+    "processors": _PROCESSORS_INFO,
+    "total_count": len(_PROCESSORS_INFO),
+    "supported_formats": SUPPORTED_FORMATS_LIST,
+    "max_file_size_mb": MAX_FILE_SIZE_MB,
+    "custom_presets_enabled": CUSTOM_PRESETS_ENABLED,
+    "custom_dimensions_enabled": CUSTOM_DIMENSIONS_ENABLED,
+}
+
+# Image decode/encode is CPU-bound and Pillow releases the GIL in its codecs, so
+# one thread per core runs them in parallel without oversubscribing memory
+IMAGE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="pixelprep-image"
+)
+
+# JPEG encode dominates request time; Pillow wheels bundle SIMD libjpeg-turbo
+if not features.check_feature("libjpeg_turbo"):
+    logger.warning(
+        "Pillow is not built with libjpeg-turbo; JPEG encoding will be slower"
+    )
 
 
 @router.post("/")
@@ -99,9 +155,11 @@ async def optimize_image(
                     status_code=400,
                     detail=f"Invalid custom parameters: {str(e)}"
                 )
+            processor_config = processor.get_preset_config()
         else:
-            # Validate preset
-            if preset not in PROCESSORS:
+            # Validate preset with a single lookup
+            processor = PROCESSORS.get(preset)
+            if processor is None:
                 available_presets = list(PROCESSORS.keys())
                 if CUSTOM_PRESETS_ENABLED:
                     available_presets.append("custom")
@@ -109,28 +167,23 @@ async def optimize_image(
                     status_code=400,
                     detail=f"Invalid preset '{preset}'. Available: {available_presets}",
                 )
-            processor = PROCESSORS[preset]
+            processor_config = PROCESSOR_CONFIGS[preset]
 
-        # Validate file
-        await _validate_upload_file(file)
+        # Validate file and read its content once
+        content = await _validate_upload_file(file)
 
         # Process the image
-        result = await _process_image(file, processor, current_user)
+        result = await _process_image(
+            content, file.filename, processor, processor_config, current_user
+        )
 
         if format == "image":
             # Return optimized image directly
             return await _create_image_response(result, preset)
         else:
-            # Return ZIP with image + metadata
-            zip_response = await _create_zip_response(result, preset)
-
-            # Convert dimensions to ASCII-safe format for headers
-            dimensions = result["metadata"].get("dimensions", "unknown")
-            if "×" in dimensions:
-                dimensions = dimensions.replace("×", "x")  # Replace Unicode × with ASCII x
-
+            # Stream ZIP with image + metadata
             return StreamingResponse(
-                io.BytesIO(zip_response),
+                _iter_zip_response(result, preset),
                 media_type="application/zip",
                 headers={
                     "Content-Disposition": f"attachment; filename=pixelprep_{preset}.zip",
@@ -138,141 +191,243 @@ async def optimize_image(
                     "X-Original-File-Size": str(result["original_file_size"]),
                     "X-Preset": preset,
                     "X-File-Size": str(len(result["image_data"])),
-                    "X-Dimensions": dimensions,
+                    "X-Dimensions": result["metadata"].get("dimensions", "unknown"),
                 },
             )
 
     except HTTPException:
         raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Image processing failed: {str(e)}"
+    except Exception:
+        logger.exception("Image optimization failed")
+        raise HTTPException(status_code=500, detail="Image processing failed")
+
+
+@router.post("/batch")
+async def optimize_image_batch(
+    file: UploadFile = File(..., description="Image file to optimize"),
+    presets: list[str] = Form(
+        ..., description="Presets to apply (e.g., 'instagram_square', 'web_display')"
+    ),
+    current_user: User | None = Depends(get_current_user_optional),
+):
+    """
+    Optimize an uploaded image with several presets from a single decode.
+
+    Args:
+        file: Image file to optimize
+        presets: Built-in presets to apply; duplicates are ignored
+
+    Returns:
+        ZIP file containing one optimized image per preset + metadata.json
+    """
+    try:
+        # Custom presets need per-request parameters, so batches take built-ins only
+        presets = list(dict.fromkeys(presets))
+        invalid_presets = [preset for preset in presets if preset not in PROCESSORS]
+        if invalid_presets:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Invalid presets {invalid_presets}. "
+                    f"Available: {list(PROCESSORS.keys())}"
+                ),
+            )
+
+        content = await _validate_upload_file(file)
+        results = await _process_image_batch(
+            content, file.filename, presets, current_user
         )
 
+        images = []
+        files_metadata = {}
+        for preset, result in zip(presets, results, strict=True):
+            optimized_filename = _optimized_filename(
+                file.filename, preset, result["metadata"]
+            )
+            images.append((optimized_filename, result["image_data"]))
+            files_metadata[preset] = {
+                "optimized_file": optimized_filename,
+                "processor_config": PROCESSOR_CONFIGS[preset],
+                "metadata": _public_metadata(result["metadata"]),
+            }
 
-async def _validate_upload_file(file: UploadFile) -> None:
-    """Validate uploaded file format and size."""
+        metadata_document = {
+            "presets": presets,
+            "original_file": file.filename,
+            "optimizations": files_metadata,
+        }
+
+        return StreamingResponse(
+            _iter_zip_archive(images, metadata_document),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": "attachment; filename=pixelprep_batch.zip",
+                "X-Original-Filename": file.filename,
+                "X-Original-File-Size": str(len(content)),
+                "X-Presets": ",".join(presets),
+            },
+        )
+
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Batch image optimization failed")
+        raise HTTPException(status_code=500, detail="Image processing failed")
+
+
+async def _validate_upload_file(file: UploadFile) -> bytes:
+    """Validate uploaded file format and size, returning the file content."""
     # Check file extension
     if not file.filename:
         raise HTTPException(status_code=400, detail="File must have a name")
 
-    file_ext = "." + file.filename.split(".")[-1].lower()
+    file_ext = os.path.splitext(file.filename)[1].lower()
     if file_ext not in SUPPORTED_FORMATS:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file format '{file_ext}'. Supported: {list(SUPPORTED_FORMATS)}",
+            detail=(
+                f"Unsupported file format '{file_ext}'. "
+                f"Supported: {SUPPORTED_FORMATS_LIST}"
+            ),
         )
 
-    # Check file size
-    content = await file.read()
-    file_size_mb = len(content) / (1024 * 1024)
-    if file_size_mb > MAX_FILE_SIZE_MB:
+    # Reject from the declared size when available, before reading anything
+    if file.size is not None:
+        check_file_size(file.size)
+
+    # Read once in bounded chunks, aborting as soon as the limit is exceeded
+    buffer = io.BytesIO()
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        check_file_size(size)
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+
+def check_file_size(size_bytes: int) -> None:
+    """Raise 413 if the upload exceeds the maximum file size."""
+    if size_bytes > MAX_FILE_SIZE_BYTES:
+        file_size_mb = size_bytes / (1024 * 1024)
         raise HTTPException(
             status_code=413,
             detail=f"File too large ({file_size_mb:.1f}MB). Maximum: {MAX_FILE_SIZE_MB}MB",
         )
 
-    # Reset file pointer
-    await file.seek(0)
+
+def _open_image(content: bytes) -> Image.Image:
+    """Open uploaded image content; only the header is parsed until pixels load."""
+    try:
+        return Image.open(io.BytesIO(content))
+    except UnidentifiedImageError:
+        raise HTTPException(
+            status_code=400, detail="Invalid image file or corrupted data"
+        )
+
+
+def _encode_image(image: Image.Image, processor) -> dict[str, Any]:
+    """Decode, process and encode an image; CPU-bound, runs off the event loop."""
+    # Let JPEG decode at a reduced scale when the preset shrinks the image anyway
+    decode_size = processor.get_decode_size(image.size)
+    if decode_size:
+        image.draft(image.mode, decode_size)
+
+    # Process the image
+    processed_image = processor.process(image)
+
+    # Encode once into memory; these bytes back both storage and the response
+    output_buffer = io.BytesIO()
+    metadata = processor.save_optimized(processed_image, output_buffer)
+
+    return {"image_data": output_buffer.getvalue(), "metadata": metadata}
+
+
+def _encode_image_copy(image: Image.Image, processor) -> dict[str, Any]:
+    """Run _encode_image on a private copy of a decoded image shared by a batch."""
+    # Processing and saving write to the image (info, encoder settings), so
+    # concurrent presets must not share one object
+    return _encode_image(image.copy(), processor)
+
+
+def _decode_for_processors(image: Image.Image, processors: list) -> None:
+    """Decode once at a scale that covers every processor's output."""
+    decode_sizes = [processor.get_decode_size(image.size) for processor in processors]
+    # Any processor that needs full resolution rules out draft scaling
+    if decode_sizes and None not in decode_sizes:
+        image.draft(image.mode, max(decode_sizes))
+    image.load()
+
+
+async def _run_image_work(func, *args):
+    """Run CPU-bound image work on IMAGE_EXECUTOR without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(IMAGE_EXECUTOR, func, *args)
 
 
 async def _process_image(
-    file: UploadFile, processor, current_user: User | None = None
+    content: bytes,
+    filename: str,
+    processor,
+    processor_config: dict[str, Any],
+    current_user: User | None = None,
 ) -> dict[str, Any]:
-    """Process uploaded image with the specified processor."""
+    """Process uploaded image content with the specified processor."""
     try:
-        # Read file content
-        content = await file.read()
         original_file_size = len(content)
-
-        # Open image with PIL
-        try:
-            image = Image.open(io.BytesIO(content))
-        except UnidentifiedImageError:
-            raise HTTPException(
-                status_code=400, detail="Invalid image file or corrupted data"
-            )
-
-        # Process the image
-        processed_image = processor.process(image)
+        image = _open_image(content)
 
         # Determine storage type based on authentication
         if current_user:
             # Authenticated user - use persistent storage
             persistent_storage = PersistentStorage(current_user.id)
+            original_metadata = {
+                "dimensions": f"{image.size[0]}x{image.size[1]}",
+                "format": image.format or "Unknown",
+                "mode": image.mode,
+            }
 
-            # Save original image first
-            tmp_original_path = None
-            tmp_optimized_path = None
+            # Upload the original while the worker thread encodes the optimized image
+            encoded, original_result = await asyncio.gather(
+                _run_image_work(_encode_image, image, processor),
+                run_in_threadpool(
+                    persistent_storage.store_original_image_bytes,
+                    content,
+                    filename,
+                    original_metadata,
+                ),
+            )
+            metadata = encoded["metadata"]
+            image_data = encoded["image_data"]
 
-            try:
-                with tempfile.NamedTemporaryFile(
-                    suffix=Path(file.filename).suffix, delete=False
-                ) as tmp_original:
-                    tmp_original_path = tmp_original.name
-                    tmp_original.write(content)
-                    tmp_original.flush()
-
-                    original_metadata = {
-                        "dimensions": f"{image.size[0]}×{image.size[1]}",
-                        "format": image.format or "Unknown",
-                        "mode": image.mode,
-                    }
-
-                    original_result = persistent_storage.store_original_image(
-                        tmp_original.name, file.filename, original_metadata
-                    )
-
-                    if not original_result["success"]:
-                        raise HTTPException(
-                            status_code=500,
-                            detail=f"Failed to store original image: {original_result['error']}",
-                        )
-
-                # Save optimized image
-                with tempfile.NamedTemporaryFile(
-                    suffix=".jpg", delete=False
-                ) as tmp_optimized:
-                    tmp_optimized_path = tmp_optimized.name
-                    metadata = processor.save_optimized(processed_image, tmp_optimized.name)
-
-                    preset_name = processor.get_preset_config().get("name", "unknown")
-                    optimization_result = persistent_storage.store_optimized_image(
-                        tmp_optimized.name,
-                        original_result["image_id"],
-                        preset_name.lower().replace(" ", "_"),
-                        metadata,
-                    )
-
-                    if not optimization_result["success"]:
-                        # Still return the image even if storage fails
-                        pass
-
-                # Read the ACTUAL saved file to ensure 100% consistency
-                # This avoids double-compression and guarantees identical file sizes
-                with open(tmp_optimized_path, 'rb') as saved_file:
-                    processed_content = io.BytesIO(saved_file.read())
-
-            finally:
-                # Clean up temporary files
-                if tmp_original_path:
-                    try:
-                        Path(tmp_original_path).unlink(missing_ok=True)
-                    except Exception:
-                        pass  # Ignore cleanup failures
-
-                if tmp_optimized_path:
-                    try:
-                        Path(tmp_optimized_path).unlink(missing_ok=True)
-                    except Exception:
-                        pass  # Ignore cleanup failures
+            if not original_result["success"]:
+                raise HTTPException(
+                    status_code=500,
+                    detail=(
+                        f"Failed to store original image: {original_result['error']}"
+                    ),
+                )
+
+            # Hand the already-encoded bytes to storage without re-encoding
+            preset_name = processor_config.get("name", "unknown")
+            optimization_result = await run_in_threadpool(
+                persistent_storage.store_optimized_image_bytes,
+                image_data,
+                original_result["image_id"],
+                preset_name.lower().replace(" ", "_"),
+                metadata,
+                file_extension=f".{_output_extension(metadata)}",
+            )
+
+            if not optimization_result["success"]:
+                # Still return the image even if storage fails
+                pass
 
             return {
-                "image_data": processed_content.getvalue(),
+                "image_data": image_data,
                 "metadata": metadata,
-                "original_filename": file.filename,
+                "original_filename": filename,
                 "original_file_size": original_file_size,
-                "processor_config": processor.get_preset_config(),
+                "processor_config": processor_config,
                 "storage_type": "persistent",
                 "user_id": current_user.id,
                 "image_id": original_result.get("image_id"),
@@ -282,74 +437,113 @@ async def _process_image(
             }
         else:
             # Anonymous user - use temporary storage
-            tmp_file_path = None
-
-            try:
-                # Save to temporary file for metadata
-                with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp_file:
-                    tmp_file_path = tmp_file.name
-                    metadata = processor.save_optimized(processed_image, tmp_file.name)
-
-                # Read the ACTUAL saved file to ensure 100% consistency
-                # This avoids double-compression and guarantees identical file sizes
-                with open(tmp_file_path, 'rb') as saved_file:
-                    processed_content = io.BytesIO(saved_file.read())
-
-                return {
-                    "image_data": processed_content.getvalue(),
-                    "metadata": metadata,
-                    "original_filename": file.filename,
-                    "original_file_size": original_file_size,
-                    "processor_config": processor.get_preset_config(),
-                    "storage_type": "temporary",
-                }
-            finally:
-                # Clean up temporary file
-                if tmp_file_path:
-                    try:
-                        Path(tmp_file_path).unlink(missing_ok=True)
-                    except Exception:
-                        pass  # Ignore cleanup failures
+            encoded = await _run_image_work(_encode_image, image, processor)
+            metadata = encoded["metadata"]
+            image_data = encoded["image_data"]
+            return {
+                "image_data": image_data,
+                "metadata": metadata,
+                "original_filename": filename,
+                "original_file_size": original_file_size,
+                "processor_config": processor_config,
+                "storage_type": "temporary",
+            }
 
     except HTTPException:
         raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Image processing error: {str(e)}")
-
+    except Exception:
+        logger.exception("Image processing error")
+        raise HTTPException(status_code=500, detail="Image processing error")
+
+
+async def _process_image_batch(
+    content: bytes,
+    filename: str,
+    presets: list[str],
+    current_user: User | None = None,
+) -> list[dict[str, Any]]:
+    """Process one upload with several built-in presets, sharing its decode."""
+    image = _open_image(content)
+    processors = [PROCESSORS[preset] for preset in presets]
+    # Read before decoding: draft() shrinks image.size to the decode scale
+    original_metadata = {
+        "dimensions": f"{image.size[0]}x{image.size[1]}",
+        "format": image.format or "Unknown",
+        "mode": image.mode,
+    }
 
-async def _create_image_response(
-    result: dict[str, Any], preset: str
-) -> StreamingResponse:
-    """Create direct image response with optimized image."""
-    original_name = result["original_filename"]
-    base_name = (
-        original_name.rsplit(".", 1)[0] if "." in original_name else original_name
+    await _run_image_work(_decode_for_processors, image, processors)
+    encodes = [
+        _run_image_work(_encode_image_copy, image, processor)
+        for processor in processors
+    ]
+
+    if not current_user:
+        return await asyncio.gather(*encodes)
+
+    persistent_storage = PersistentStorage(current_user.id)
+    *results, original_result = await asyncio.gather(
+        *encodes,
+        run_in_threadpool(
+            persistent_storage.store_original_image_bytes,
+            content,
+            filename,
+            original_metadata,
+        ),
     )
-    optimized_filename = f"{base_name}_{preset}.jpg"
 
-    # Determine content type based on processor format
-    processor_config = result["processor_config"]
-    format_type = processor_config.get(
-        "primary_format", processor_config.get("format", "JPEG")
-    )
+    if not original_result["success"]:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to store original image: {original_result['error']}",
+        )
+
+    for preset, result in zip(presets, results, strict=True):
+        # Still return the images even if an optimized upload fails
+        preset_name = PROCESSOR_CONFIGS[preset].get("name", "unknown")
+        await run_in_threadpool(
+            persistent_storage.store_optimized_image_bytes,
+            result["image_data"],
+            original_result["image_id"],
+            preset_name.lower().replace(" ", "_"),
+            result["metadata"],
+            file_extension=f".{_output_extension(result['metadata'])}",
+        )
 
-    if format_type.upper() == "WEBP":
-        media_type = "image/webp"
-        file_ext = "webp"
-    else:
-        media_type = "image/jpeg"
-        file_ext = "jpg"
+    return results
 
-    # Update filename extension
-    optimized_filename = f"{base_name}_{preset}.{file_ext}"
 
-    # Convert dimensions to ASCII-safe format for headers
-    dimensions = result["metadata"].get("dimensions", "unknown")
-    if "×" in dimensions:
-        dimensions = dimensions.replace("×", "x")  # Replace Unicode × with ASCII x
+def _output_extension(metadata: dict[str, Any]) -> str:
+    """File extension matching the format the optimized bytes were encoded in."""
+    return OUTPUT_EXTENSIONS.get(metadata.get("format", "JPEG").upper(), "jpg")
 
-    return StreamingResponse(
-        io.BytesIO(result["image_data"]),
+
+def _optimized_filename(
+    original_name: str, preset: str, metadata: dict[str, Any]
+) -> str:
+    """Build the download name for an optimized image."""
+    head, dot, _ = original_name.rpartition(".")
+    base_name = head if dot else original_name
+    return f"{base_name}_{preset}.{_output_extension(metadata)}"
+
+
+def _public_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Drop server-side fields from processor metadata before returning it."""
+    return {k: v for k, v in metadata.items() if k != "file_path"}
+
+
+async def _create_image_response(result: dict[str, Any], preset: str) -> Response:
+    """Create direct image response with optimized image."""
+    # Content type follows the format the bytes were actually encoded in
+    file_ext = _output_extension(result["metadata"])
+    media_type = OUTPUT_MEDIA_TYPES[file_ext]
+    optimized_filename = _optimized_filename(
+        result["original_filename"], preset, result["metadata"]
+    )
+
+    # The encoded bytes are already in memory; send them as one sized body
+    return Response(
+        content=result["image_data"],
         media_type=media_type,
         headers={
             "Content-Disposition": f"attachment; filename={optimized_filename}",
@@ -357,70 +551,84 @@ async def _create_image_response(
             "X-Original-File-Size": str(result["original_file_size"]),
             "X-Preset": preset,
             "X-File-Size": str(len(result["image_data"])),
-            "X-Dimensions": dimensions,
+            "X-Dimensions": result["metadata"].get("dimensions", "unknown"),
         },
     )
 
 
-async def _create_zip_response(result: dict[str, Any], preset: str) -> bytes:
-    """Create ZIP file containing optimized image and metadata."""
-    zip_buffer = io.BytesIO()
+class _ZipChunkSink(io.RawIOBase):
+    """Write-only, non-seekable sink that hands ZIP output back in chunks."""
 
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        # Add optimized image
-        original_name = result["original_filename"]
-        base_name = (
-            original_name.rsplit(".", 1)[0] if "." in original_name else original_name
-        )
-        optimized_filename = f"{base_name}_{preset}.jpg"
+    def __init__(self):
+        self._chunks: list[bytes] = []
 
-        zip_file.writestr(optimized_filename, result["image_data"])
+    def writable(self) -> bool:
+        return True
 
-        # Add metadata as JSON
-        import json
+    def write(self, data) -> int:
+        # bytes pass through as-is so the image payload is never copied
+        self._chunks.append(data if isinstance(data, bytes) else bytes(data))
+        return len(data)
 
-        metadata_content = json.dumps(
-            {
-                "preset": preset,
-                "original_file": result["original_filename"],
-                "optimized_file": optimized_filename,
-                "processor_config": result["processor_config"],
-                "metadata": {
-                    k: v
-                    for k, v in result["metadata"].items()
-                    if k != "file_path"  # Exclude temp file path
-                },
-            },
-            indent=2,
-        )
+    def drain(self) -> list[bytes]:
+        """Return and forget everything written since the last drain."""
+        chunks, self._chunks = self._chunks, []
+        return chunks
 
-        zip_file.writestr("metadata.json", metadata_content)
 
-    return zip_buffer.getvalue()
+def _iter_zip_response(result: dict[str, Any], preset: str) -> AsyncIterator[bytes]:
+    """Stream a ZIP file containing optimized image and metadata."""
+    optimized_filename = _optimized_filename(
+        result["original_filename"], preset, result["metadata"]
+    )
+    metadata_document = {
+        "preset": preset,
+        "original_file": result["original_filename"],
+        "optimized_file": optimized_filename,
+        "processor_config": result["processor_config"],
+        "metadata": _public_metadata(result["metadata"]),
+    }
+    return _iter_zip_archive(
+        [(optimized_filename, result["image_data"])], metadata_document
+    )
+
+
+async def _iter_zip_archive(
+    images: list[tuple[str, bytes]], metadata_document: dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP of already-encoded images plus metadata.json.
+
+    Async so Starlette iterates it on the event loop rather than hopping to
+    the threadpool for every chunk.
+    """
+    sink = _ZipChunkSink()
+
+    # Image payloads are already entropy-coded, so store them; only the JSON deflates
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as zip_file:
+        for filename, image_data in images:
+            zip_file.writestr(filename, image_data)
+            for chunk in sink.drain():
+                yield chunk
+
+        zip_file.writestr(
+            "metadata.json",
+            json.dumps(metadata_document, indent=2),
+            compress_type=zipfile.ZIP_DEFLATED,
+            compresslevel=1,
+        )
+        for chunk in sink.drain():
+            yield chunk
+
+    # Central directory is written when the archive closes
+    for chunk in sink.drain():
+        yield chunk
 
 
 @router.get("/processors")
 async def get_available_processors():
     """Get list of available image processors."""
-    processors_info = {}
-    for processor_id, processor in PROCESSORS.items():
-        processors_info[processor_id] = processor.get_preset_config()
-
-    # Add custom processor when feature flag is enabled
-    if CUSTOM_PRESETS_ENABLED:
-        # Create a default custom processor instance for metadata
-        from ..processors.custom import CustomProcessor
-        default_custom = CustomProcessor()
-        processors_info["custom"] = default_custom.get_preset_config()
-
-    return {
-        "processors": processors_info,
-        "total_count": len(processors_info),
-        "supported_formats": list(SUPPORTED_FORMATS),
-        "max_file_size_mb": MAX_FILE_SIZE_MB,
-        "custom_presets_enabled": CUSTOM_PRESETS_ENABLED,
-        "custom_dimensions_enabled": CUSTOM_DIMENSIONS_ENABLED,
-    }
+    return PROCESSORS_INFO_RESPONSE
 
 
 # Authenticated user endpoints for image management
@@ -440,10 +648,11 @@ async def get_user_images(
                 status_code=500, detail=f"Failed to retrieve images: {result['error']}"
             )
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error retrieving user images: {str(e)}"
-        )
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error retrieving user images")
+        raise HTTPException(status_code=500, detail="Error retrieving user images")
 
 
 @router.get("/images/{image_id}/optimizations")
@@ -463,9 +672,12 @@ async def get_image_optimizations(
                 detail=f"Image not found or access denied: {result['error']}",
             )
 
-    except Exception as e:
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error retrieving optimization history")
         raise HTTPException(
-            status_code=500, detail=f"Error retrieving optimization history: {str(e)}"
+            status_code=500, detail="Error retrieving optimization history"
         )
 
 
@@ -486,8 +698,11 @@ async def delete_user_image(
                 detail=f"Image not found or access denied: {result['error']}",
             )
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error deleting image: {str(e)}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error deleting image")
+        raise HTTPException(status_code=500, detail="Error deleting image")
 
 
 @router.get("/usage")
@@ -505,7 +720,8 @@ async def get_storage_usage(current_user: User = Depends(get_current_user)):
                 detail=f"Failed to retrieve usage statistics: {result['error']}",
             )
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error retrieving storage usage: {str(e)}"
-        )
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error retrieving storage usage")
+        raise HTTPException(status_code=500, detail="Error retrieving storage usage")
@@ -1,7 +1,9 @@
+import math
 from abc import ABC, abstractmethod
 from typing import Any
 
 from PIL import Image
+
 from .optimization_utils import OptimizationUtils
 
 
@@ -31,61 +33,111 @@ class BaseProcessor(ABC):
         """
         pass
 
+    def get_decode_size(self, image_size: tuple[int, int]) -> tuple[int, int] | None:
+        """
+        Get the smallest decode size that still yields full output quality.
+
+        Used with Image.draft() so JPEG sources can be DCT-downscaled while
+        decoding. Processors that shrink images override this.
+
+        Args:
+            image_size: (width, height) of the source image
+
+        Returns:
+            Minimum (width, height) to decode at, or None to decode at full size
+        """
+        return None
+
+    def _scaled_decode_size(
+        self, image_size: tuple[int, int], scale: float
+    ) -> tuple[int, int] | None:
+        """Scale image_size for decoding, or None if no 2x reduction is possible."""
+        # JPEG draft only reduces by 1/2, 1/4 or 1/8
+        if scale > 0.5:
+            return None
+        width, height = image_size
+        return math.ceil(width * scale), math.ceil(height * scale)
+
     def _fix_orientation_and_ensure_rgb(self, image: Image.Image) -> Image.Image:
         """Fix EXIF orientation and convert image to RGB mode if necessary."""
         # First fix orientation based on EXIF data
         image = OptimizationUtils.fix_image_orientation(image)
 
         # Then ensure RGB mode
-        if image.mode in ('RGBA', 'LA'):
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            if image.mode == 'RGBA':
-                background.paste(image, mask=image.split()[-1])
-            else:
-                background.paste(image, mask=image.split()[-1])
-            return background
-        elif image.mode != 'RGB':
-            return image.convert('RGB')
-        return image
+        return self._ensure_rgb(image)
 
     def _ensure_rgb(self, image: Image.Image) -> Image.Image:
         """Convert image to RGB mode if necessary."""
+        # Most uploads are already RGB (e.g. decoded JPEGs), so check that first
+        if image.mode == 'RGB':
+            return image
         if image.mode in ('RGBA', 'LA'):
             background = Image.new('RGB', image.size, (255, 255, 255))
-            if image.mode == 'RGBA':
-                background.paste(image, mask=image.split()[-1])
-            else:
-                background.paste(image, mask=image.split()[-1])
+            # An RGBA/LA mask uses its alpha band directly, no split() band copies
+            background.paste(image, mask=image)
             return background
-        elif image.mode != 'RGB':
-            return image.convert('RGB')
-        return image
+        return image.convert('RGB')
 
     def _smart_crop(self, image: Image.Image, target_width: int, target_height: int) -> Image.Image:
         """
         Smart crop image to target dimensions while preserving important content.
         Centers the crop on the image.
         """
-        current_width, current_height = image.size
-        target_ratio = target_width / target_height
-        current_ratio = current_width / current_height
+        return image.crop(
+            self._center_crop_box(image.size, target_width, target_height)
+        )
 
-        if current_ratio > target_ratio:
+    def _center_crop_box(
+        self, image_size: tuple[int, int], target_width: int, target_height: int
+    ) -> tuple[int, int, int, int]:
+        """Get the centered crop box matching the target aspect ratio."""
+        current_width, current_height = image_size
+
+        # Compare aspect ratios by cross-multiplying, so the crop box is integer math
+        if current_width * target_height > target_width * current_height:
             # Image is wider than target, crop horizontally
-            new_width = int(current_height * target_ratio)
+            new_width = current_height * target_width // target_height
             left = (current_width - new_width) // 2
-            right = left + new_width
-            return image.crop((left, 0, right, current_height))
+            return (left, 0, left + new_width, current_height)
         else:
             # Image is taller than target, crop vertically
-            new_height = int(current_width / target_ratio)
+            new_height = current_width * target_height // target_width
             top = (current_height - new_height) // 2
-            bottom = top + new_height
-            return image.crop((0, top, current_width, bottom))
+            return (0, top, current_width, top + new_height)
+
+    def _resize_with_quality(
+        self,
+        image: Image.Image,
+        target_width: int,
+        target_height: int,
+        box: tuple[int, int, int, int] | None = None,
+    ) -> Image.Image:
+        """Resize image (or the given source box of it) with high quality resampling."""
+        left, top, right, bottom = box or (0, 0, *image.size)
+        ratio = max((right - left) / target_width, (bottom - top) / target_height)
+        if ratio < 2.0:
+            # Mild scale changes look the same with the cheaper bicubic kernel
+            return image.resize(
+                (target_width, target_height), Image.Resampling.BICUBIC, box=box
+            )
+        # For 4x+ downscales, box-reduce by an integer factor first so LANCZOS
+        # only runs over roughly 2x the target
+        return image.resize(
+            (target_width, target_height),
+            Image.Resampling.LANCZOS,
+            box=box,
+            reducing_gap=2.0,
+        )
 
-    def _resize_with_quality(self, image: Image.Image, target_width: int, target_height: int) -> Image.Image:
-        """Resize image with high quality resampling."""
-        return image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+    def _crop_and_resize(
+        self, image: Image.Image, target_width: int, target_height: int
+    ) -> Image.Image:
+        """Center-crop to the target aspect ratio and resize in one resampling pass."""
+        box = self._center_crop_box(image.size, target_width, target_height)
+        if (box[2] - box[0], box[3] - box[1]) == (target_width, target_height):
+            return image.crop(box)
+        # Resampling straight from the source box skips allocating the cropped copy
+        return self._resize_with_quality(image, target_width, target_height, box=box)
 
     def get_compression_params(self, quality: int = 95, format_type: str = 'JPEG') -> dict[str, Any]:
         """
@@ -1,9 +1,15 @@
 import io
-from typing import Any
+import math
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, BinaryIO
 
 from PIL import Image, ImageFile
 
 from .base import BaseProcessor
+from .optimization_utils import PROBE_OPTIMIZE, OptimizationUtils
 
 # Allow loading of truncated images
 ImageFile.LOAD_TRUNCATED_IMAGES = True
@@ -16,7 +22,48 @@ class QuickCompressProcessor(BaseProcessor):
     FORMAT = 'JPEG'
     QUALITY_START = 95
     QUALITY_MIN = 30
-    MAX_ITERATIONS = 20
+    # Typical Q95 JPEG size as a fraction of the raw pixel bytes (~3.6 bits/RGB pixel)
+    ESTIMATED_JPEG_RATIO = 0.15
+    # Qualities encoded concurrently per round when the search runs in parallel
+    PARALLEL_CANDIDATES = 4
+    # Above this size the quality search probes a PROBE_GRID x PROBE_GRID mosaic
+    # of PROBE_TILE px full-resolution tiles (a multiple of the 16px JPEG MCU)
+    PROBE_MIN_PIXELS = 4_000_000
+    PROBE_GRID = 8
+    PROBE_TILE = 64
+    # Built once from the class constants; read-only so callers can't mutate the
+    # shared copy
+    _PRESET_CONFIG = MappingProxyType({
+        'name': 'Quick Compress',
+        'description': 'Reduce file size by 70% while keeping original dimensions',
+        'dimensions': 'Original dimensions preserved',
+        'size_reduction': f'{TARGET_REDUCTION_PERCENT}% smaller',
+        'format': FORMAT,
+        'aspect_ratio': 'Preserved',
+        'use_case': 'Storage optimization, faster uploads, bandwidth saving'
+    })
+
+    def __init__(self, parallel: bool = False):
+        """
+        Args:
+            parallel: Encode several candidate qualities at once in the quality search
+        """
+        self._pool = (
+            ThreadPoolExecutor(
+                max_workers=self.PARALLEL_CANDIDATES,
+                thread_name_prefix='pixelprep-compress',
+            )
+            if parallel
+            else None
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Thread pools can't be pickled (e.g. into a process pool worker); rebuild
+        # it there
+        return {'parallel': self._pool is not None}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)
 
     def process(self, image: Image.Image) -> Image.Image:
         """
@@ -26,9 +73,10 @@ class QuickCompressProcessor(BaseProcessor):
             image: Input PIL Image
             
         Returns:
-            Processed PIL Image with reduced file size
+            RGB PIL Image carrying its compressed JPEG encoding in info
         """
         # Fix orientation and ensure RGB mode for JPEG output (most efficient compression)
+        source = image
         image = self._fix_orientation_and_ensure_rgb(image)
 
         # Get original file size estimate
@@ -36,23 +84,32 @@ class QuickCompressProcessor(BaseProcessor):
         target_size = original_size * (1 - self.TARGET_REDUCTION_PERCENT / 100)
 
         # Compress to target size while keeping original dimensions
-        compressed_image = self._compress_to_target_size(image, target_size)
+        quality, data = self._compress_to_target_size(image, target_size)
 
-        return compressed_image
+        return OptimizationUtils.attach_encoding(image, source, quality, data)
 
-    def get_preset_config(self) -> dict[str, Any]:
+    def get_preset_config(self) -> Mapping[str, Any]:
         """Get quick compress preset configuration."""
-        return {
-            'name': 'Quick Compress',
-            'description': 'Reduce file size by 70% while keeping original dimensions',
-            'dimensions': 'Original dimensions preserved',
-            'size_reduction': f'{self.TARGET_REDUCTION_PERCENT}% smaller',
-            'format': self.FORMAT,
-            'aspect_ratio': 'Preserved',
-            'use_case': 'Storage optimization, faster uploads, bandwidth saving'
-        }
+        return self._PRESET_CONFIG
 
     def _estimate_file_size(self, image: Image.Image) -> int:
+        """
+        Estimate original file size from the raw pixel size, without encoding.
+
+        The 70% reduction target is relative, so a typical Q95 ratio is close
+        enough for process()'s search and saves a full encode there. Reported
+        metadata uses _estimate_file_size_precise.
+
+        Args:
+            image: PIL Image
+
+        Returns:
+            Estimated file size in bytes
+        """
+        width, height = image.size
+        return int(width * height * len(image.getbands()) * self.ESTIMATED_JPEG_RATIO)
+
+    def _estimate_file_size_precise(self, image: Image.Image) -> int:
         """
         Estimate original file size by saving at high quality.
         
@@ -66,7 +123,9 @@ class QuickCompressProcessor(BaseProcessor):
         image.save(buffer, format=self.FORMAT, quality=95, optimize=True)
         return buffer.tell()
 
-    def _compress_to_target_size(self, image: Image.Image, target_size: int) -> Image.Image:
+    def _compress_to_target_size(
+        self, image: Image.Image, target_size: int
+    ) -> tuple[int, bytes]:
         """
         Compress image to approximately target file size.
         
@@ -75,130 +134,237 @@ class QuickCompressProcessor(BaseProcessor):
             target_size: Target file size in bytes
             
         Returns:
-            Compressed PIL Image
+            Tuple of (chosen quality, encoded JPEG bytes)
         """
-        quality = self.QUALITY_START
-        best_quality = quality
-        best_size_diff = float('inf')
-        iterations = 0
+        # Highest quality landing within 10% of the target
+        max_size = target_size * 1.1
+        width, height = image.size
+        probe_side = self.PROBE_GRID * self.PROBE_TILE
+        high = None
+
+        if width * height > self.PROBE_MIN_PIXELS and min(width, height) >= probe_side:
+            # JPEG size is roughly proportional to pixel count at a given quality,
+            # so search a tile sample against the proportionally scaled target
+            probe = self._probe_mosaic(image)
+            best_quality = self._search_quality(
+                probe, max_size * probe_side * probe_side / (width * height)
+            )
+            if best_quality is not None:
+                data = self._encode(image, best_quality)
+                if len(data) <= max_size:
+                    return best_quality, data
+                # The sample overestimated the quality, so search below it at full size
+                high = best_quality - 1
+
+        # Fall back to the floor if even QUALITY_MIN is too large
+        best_quality = self._search_quality(image, max_size, high)
+        if best_quality is None:
+            best_quality = self.QUALITY_MIN
 
-        while quality >= self.QUALITY_MIN and iterations < self.MAX_ITERATIONS:
-            output_buffer = io.BytesIO()
+        # Generate final compressed image with best quality found
+        return best_quality, self._encode(image, best_quality)
 
-            # Save with current quality
-            save_kwargs = {
-                'format': self.FORMAT,
-                'quality': quality,
-                'optimize': True,
-                'progressive': True if quality > 60 else False  # Progressive for higher quality
-            }
+    def _encode(self, image: Image.Image, quality: int) -> bytes:
+        """Encode image with the final (optimized) save settings for quality."""
+        output_buffer = io.BytesIO()
+        image.save(output_buffer, **self._save_kwargs(quality))
+        return output_buffer.getvalue()
 
-            image.save(output_buffer, **save_kwargs)
-            current_size = output_buffer.tell()
+    def _probe_mosaic(self, image: Image.Image) -> Image.Image:
+        """
+        Sample an evenly spaced grid of full-resolution tiles into one small image.
 
-            # Calculate how close we are to target
-            size_diff = abs(current_size - target_size)
+        Downscaling would smooth away the noise and fine detail that drive JPEG
+        size; untouched tiles keep the image's per-block statistics.
 
-            # If this is closer to target than previous attempts, save it
-            if size_diff < best_size_diff:
-                best_quality = quality
-                best_size_diff = size_diff
+        Args:
+            image: PIL Image at least PROBE_GRID * PROBE_TILE px on each side
 
-            # If we're very close to target or under target, use this quality
-            if current_size <= target_size * 1.1:  # Within 10% of target
-                best_quality = quality
-                break
+        Returns:
+            PROBE_GRID * PROBE_TILE px square mosaic
+        """
+        grid, tile = self.PROBE_GRID, self.PROBE_TILE
+        width, height = image.size
+        mosaic = Image.new(image.mode, (grid * tile, grid * tile))
+
+        for row in range(grid):
+            # Snap tile origins to the 16px MCU grid
+            top = (height - tile) * row // (grid - 1) // 16 * 16
+            for column in range(grid):
+                left = (width - tile) * column // (grid - 1) // 16 * 16
+                mosaic.paste(
+                    image.crop((left, top, left + tile, top + tile)),
+                    (column * tile, row * tile),
+                )
+
+        return mosaic
+
+    def _encode_size(
+        self, image: Image.Image, quality: int, buffer: io.BytesIO | None = None
+    ) -> int:
+        """
+        Encode image at the given quality and return the JPEG size in bytes.
 
-            # Adjust quality based on how far we are from target
-            if current_size > target_size * 1.5:
-                quality -= 10  # Large reduction if way over
-            elif current_size > target_size * 1.2:
-                quality -= 7   # Medium reduction
-            else:
-                quality -= 3   # Small reduction if close
+        Args:
+            image: PIL Image to encode
+            quality: JPEG quality
+            buffer: Scratch buffer to reuse across probes of one search; emptied first
 
-            iterations += 1
+        Returns:
+            Encoded size in bytes
+        """
+        if buffer is None:
+            buffer = io.BytesIO()
+        else:
+            buffer.seek(0)
+            buffer.truncate()
+        image.save(buffer, **self._save_kwargs(quality, probe=True))
+        return buffer.tell()
 
-        # Generate final compressed image with best quality found
-        output_buffer = io.BytesIO()
-        save_kwargs = {
-            'format': self.FORMAT,
-            'quality': best_quality,
-            'optimize': True,
-            'progressive': True if best_quality > 60 else False
-        }
+    def _search_quality(
+        self, image: Image.Image, max_size: float, high: int | None = None
+    ) -> int | None:
+        """
+        Search the highest quality whose encoded size fits max_size.
 
-        image.save(output_buffer, **save_kwargs)
-        output_buffer.seek(0)
-        return Image.open(output_buffer)
+        JPEG size grows monotonically with quality and roughly exponentially,
+        so once one probe fits and one overshoots, the next probe is
+        interpolated on log(size) between them instead of taken at the
+        midpoint. On photographic content this usually saves an encode or
+        two over plain bisection and picks the same quality.
 
-    def save_optimized(self, image: Image.Image, output_path: str) -> dict[str, Any]:
-        """
-        Save compressed image and return metadata with compression stats.
-        
         Args:
-            image: Processed PIL Image
-            output_path: Path to save the image
-            
+            image: PIL Image to compress
+            max_size: Largest acceptable file size in bytes
+            high: Highest quality to consider, QUALITY_START by default
+
         Returns:
-            Dictionary with save metadata including compression ratio
+            Highest fitting quality, or None if even QUALITY_MIN is too large
         """
-        # Estimate original size for comparison
-        original_size_estimate = self._estimate_file_size(image)
-
-        # Find the quality that gives us the best compression ratio
-        target_size = original_size_estimate * (1 - self.TARGET_REDUCTION_PERCENT / 100)
-
-        quality = self.QUALITY_START
-        final_quality = quality
-        best_compression_ratio = 0
+        if self._pool is not None:
+            return self._search_quality_parallel(image, max_size, high)
+
+        low = self.QUALITY_MIN
+        high = self.QUALITY_START if high is None else high
+        best_quality = None
+        # (quality, size) of the closest probes below and above max_size
+        fitting = overshooting = None
+        # One scratch buffer per call, so concurrent searches never share it
+        buffer = io.BytesIO()
 
-        while quality >= self.QUALITY_MIN:
-            test_buffer = io.BytesIO()
-            save_kwargs = {
-                'format': self.FORMAT,
-                'quality': quality,
-                'optimize': True,
-                'progressive': True if quality > 60 else False
-            }
+        while low <= high:
+            if fitting and overshooting:
+                fit_quality, fit_size = fitting
+                over_quality, over_size = overshooting
+                fraction = (
+                    math.log(max_size / fit_size) / math.log(over_size / fit_size)
+                )
+                quality = fit_quality + int(fraction * (over_quality - fit_quality))
+                quality = min(max(quality, low), high)
+            else:
+                quality = (low + high) // 2
 
-            image.save(test_buffer, **save_kwargs)
-            current_size = test_buffer.tell()
+            size = self._encode_size(image, quality, buffer)
+            if size <= max_size:
+                best_quality = quality
+                low = quality + 1
+                fitting = (quality, size)
+            else:
+                high = quality - 1
+                overshooting = (quality, size)
 
-            # Calculate compression ratio
-            compression_ratio = (1 - current_size / original_size_estimate) * 100
+        return best_quality
 
-            # If we're close to target reduction or better, use this quality
-            if compression_ratio >= self.TARGET_REDUCTION_PERCENT * 0.9:  # Within 90% of target
-                final_quality = quality
-                best_compression_ratio = compression_ratio
-                break
+    def _search_quality_parallel(
+        self, image: Image.Image, max_size: float, high: int | None = None
+    ) -> int | None:
+        """
+        Same search as _search_quality, encoding several qualities per round.
 
-            quality -= 5
+        Each round probes up to PARALLEL_CANDIDATES evenly spaced qualities
+        concurrently. libjpeg releases the GIL while encoding, so a round
+        costs about one encode of wall-clock time and 3 rounds cover the range.
 
-        # Save with optimal settings
-        save_kwargs = {
-            'format': self.FORMAT,
-            'quality': final_quality,
-            'optimize': True,
-            'progressive': True if final_quality > 60 else False
-        }
+        Args:
+            image: PIL Image to compress
+            max_size: Largest acceptable file size in bytes
+            high: Highest quality to consider, QUALITY_START by default
 
-        image.save(output_path, **save_kwargs)
+        Returns:
+            Highest fitting quality, or None if even QUALITY_MIN is too large
+        """
+        low = self.QUALITY_MIN
+        high = self.QUALITY_START if high is None else high
+        best_quality = None
+
+        while low <= high:
+            splits = self.PARALLEL_CANDIDATES + 1
+            candidates = sorted({
+                low + (high - low) * step // splits for step in range(1, splits)
+            })
+            # Image.save() stores its options on the image, so each thread
+            # encodes its own copy; list() waits for the whole round
+            sizes = list(self._pool.map(
+                lambda quality: self._encode_size(image.copy(), quality), candidates
+            ))
+
+            # Sizes grow with quality, so the fitting candidates form a prefix
+            for quality, size in zip(candidates, sizes, strict=True):
+                if size <= max_size:
+                    best_quality = quality
+                    low = quality + 1
+                else:
+                    high = quality - 1
+                    break
+
+        return best_quality
+
+    def save_optimized(
+        self, image: Image.Image, output_path: str | BinaryIO
+    ) -> dict[str, Any]:
+        """
+        Save compressed image and return metadata with compression stats.
+        
+        Args:
+            image: Processed PIL Image
+            output_path: Path or binary buffer to save the image to
+            
+        Returns:
+            Dictionary with save metadata including compression ratio
+        """
+        # The reported reduction is measured against a real Q95 encode;
+        # process()'s pixel-based estimate only sets its search target
+        original_size_estimate = self._estimate_file_size_precise(image)
+
+        encoding = OptimizationUtils.pop_encoding(image)
+        if encoding is not None:
+            final_quality = encoding['quality']
+            data = encoding['data']
+        else:
+            # Highest quality reaching 90% of the target reduction, else QUALITY_START
+            max_size = original_size_estimate * (
+                1 - self.TARGET_REDUCTION_PERCENT * 0.9 / 100
+            )
+            final_quality = self._search_quality(image, max_size)
+            if final_quality is None:
+                final_quality = self.QUALITY_START
+
+            # Encode with optimal settings
+            data = self._encode(image, final_quality)
+
+        final_file_size = OptimizationUtils.write_encoded(output_path, data)
 
         # Return metadata
-        import os
-        final_file_size = os.path.getsize(output_path)
         actual_reduction = (1 - final_file_size / original_size_estimate) * 100
 
         return {
-            'file_path': output_path,
+            'file_path': OptimizationUtils.get_output_file_path(output_path),
             'file_size_bytes': final_file_size,
             'file_size_mb': round(final_file_size / (1024 * 1024), 2),
             'original_size_estimate': original_size_estimate,
             'original_size_mb': round(original_size_estimate / (1024 * 1024), 2),
             'quality': final_quality,
-            'dimensions': f'{image.size[0]}×{image.size[1]}',
+            'dimensions': f'{image.size[0]}x{image.size[1]}',
             'format': self.FORMAT,
             'compression_ratio': f'{actual_reduction:.1f}%',
             'target_achieved': actual_reduction >= self.TARGET_REDUCTION_PERCENT * 0.8,
@@ -207,9 +373,31 @@ class QuickCompressProcessor(BaseProcessor):
 
     def get_compression_params(self, quality: int = 95) -> dict[str, Any]:
         """Get quick compress-specific compression parameters with dynamic progressive setting."""
+        return dict(self._save_kwargs(quality))
+
+    @classmethod
+    @lru_cache(maxsize=132)
+    def _save_kwargs(cls, quality: int, probe: bool = False) -> dict[str, Any]:
+        """
+        Cached save() kwargs for every quality the search can try.
+
+        Size probes encode baseline JPEG without Huffman optimization (see
+        PROBE_OPTIMIZE): several times faster than progressive, and a few
+        percent larger, so the search never overshoots the final encode.
+
+        The returned dict is shared between calls and must not be mutated;
+        get_compression_params() hands out copies.
+        """
+        if probe:
+            return {
+                'format': cls.FORMAT,
+                'quality': quality,
+                'optimize': PROBE_OPTIMIZE,
+                'progressive': False
+            }
         return {
-            'format': self.FORMAT,
+            'format': cls.FORMAT,
             'quality': quality,
             'optimize': True,
-            'progressive': True if quality > 60 else False  # Dynamic progressive based on quality
+            'progressive': quality > 60  # Dynamic progressive based on quality
         }
@@ -1,5 +1,7 @@
+import pytest
 from PIL import Image
 
+from .base import BaseProcessor
 from .custom import CustomProcessor, create_custom_processor
 
 
@@ -30,6 +32,14 @@ class TestCustomProcessor:
         assert config['format'] == 'JPEG'
         assert config['customizable'] is True
 
+    def test_rejects_unreachable_size(self):
+        """Test dimensions that can't reach the size limit are rejected up front."""
+        with pytest.raises(ValueError, match='Impossible combination'):
+            CustomProcessor(8000, 6000, 0.5, 'JPEG', strategy='size')
+
+        # The same size limit is reachable as a palette PNG at smaller dimensions
+        CustomProcessor(1000, 1000, 0.5, 'PNG')
+
     def test_factory_function(self):
         """Test custom processor factory function."""
         processor = create_custom_processor(640, 480, 1.5, 'PNG')
@@ -62,7 +72,7 @@ class TestCustomProcessor:
             metadata = processor.save_optimized(image, tmp.name)
 
             assert metadata['format'] == 'JPEG'
-            assert metadata['dimensions'] == '600×400'
+            assert metadata['dimensions'] == '600x400'
             assert metadata['custom_width'] == 600
             assert metadata['custom_height'] == 400
             assert metadata['max_size_mb'] == 1.0
@@ -72,6 +82,167 @@ class TestCustomProcessor:
             saved_image = Image.open(tmp.name)
             assert saved_image.size == (600, 400)
 
+    def test_save_optimized_png(self):
+        """Test PNG save_optimized without process() skips the quality search."""
+        import io
+        processor = CustomProcessor(format='PNG', max_size_mb=2.0)
+        image = Image.new('RGB', (300, 200), (100, 150, 200))
+
+        buffer = io.BytesIO()
+        metadata = processor.save_optimized(image, buffer)
+
+        assert metadata['format'] == 'PNG'
+        assert 'quality' not in metadata
+        assert metadata['palette_reduced'] is False
+        assert Image.open(buffer).size == (300, 200)
+
+    def test_save_optimized_png_palette_fallback(self):
+        """Test an oversized PNG is quantized to a palette to fit the limit."""
+        import io
+        processor = CustomProcessor(format='PNG', max_size_mb=1.0)
+        image = Image.effect_noise((800, 600), 60).convert('RGB')
+
+        buffer = io.BytesIO()
+        metadata = processor.save_optimized(image, buffer)
+
+        assert metadata['palette_reduced'] is True
+        assert metadata['meets_size_requirement'] is True
+        assert Image.open(buffer).mode == 'P'
+
+    def test_webp_fallback_to_jpeg_with_alpha(self, monkeypatch):
+        """Test an RGBA image still encodes when WebP falls back to JPEG."""
+        import io
+        save = Image.Image.save
+
+        def save_without_webp(image, fp, format=None, **params):
+            if format == 'WEBP':
+                raise OSError('encoder webp not available')
+            return save(image, fp, format, **params)
+
+        monkeypatch.setattr(Image.Image, 'save', save_without_webp)
+        processor = CustomProcessor(format='WEBP', max_size_mb=1.0)
+        image = Image.new('RGBA', (300, 200), (100, 150, 200, 128))
+
+        buffer = io.BytesIO()
+        metadata = processor.save_optimized(processor.process(image), buffer)
+
+        assert metadata['format'] == 'JPEG'
+        assert Image.open(buffer).format == 'JPEG'
+
+    def test_max_dimension_and_target_resize_once(self):
+        """Test max_dimension plus target dimensions resample the image only once."""
+        processor = CustomProcessor(800, 400, 2.0, 'JPEG', max_dimension=1000)
+        image = Image.new('RGB', (2000, 2000), (100, 150, 200))
+
+        resize_calls = []
+        resize_with_quality = processor._resize_with_quality
+
+        def counting_resize(*args, **kwargs):
+            resize_calls.append(args)
+            return resize_with_quality(*args, **kwargs)
+
+        processor._resize_with_quality = counting_resize
+        result = processor.process(image)
+
+        assert result.size == (800, 400)
+        assert len(resize_calls) == 1
+
+    def test_resize_in_strips_matches_single_resize(self):
+        """Test strip-parallel resizing gives exactly the single-pass result."""
+        from PIL import ImageChops
+        processor = CustomProcessor(max_dimension=300)
+        mandelbrot = Image.effect_mandelbrot((1200, 900), (-2, -1.2, 1, 1.2), 100)
+        image = mandelbrot.convert('RGB')
+        cases = (((300, 225), None), ((500, 400), (100, 50, 1100, 850)))
+
+        for target_size, box in cases:
+            expected = BaseProcessor._resize_with_quality(
+                processor, image, *target_size, box
+            )
+            result = processor._resize_in_strips(image, *target_size, box, strips=3)
+
+            assert ImageChops.difference(result, expected).getbbox() is None
+
+    def test_get_decode_size(self):
+        """Test decode size covers the planned output in either orientation."""
+        assert CustomProcessor().get_decode_size((4000, 3000)) is None
+        processor = CustomProcessor(max_dimension=1000)
+        assert processor.get_decode_size((4000, 3000)) == (1000, 750)
+        # A 4:3 source may be rotated, so the 800px width must be met by the short side
+        assert CustomProcessor(800, 800).get_decode_size((4000, 3000)) == (1067, 800)
+        assert CustomProcessor(3000, 3000).get_decode_size((4000, 3000)) is None
+
+    def test_quality_strategy_falls_back_to_420(self):
+        """Test a JPEG that misses the limit at 4:4:4 is searched again at 4:2:0."""
+        import io
+        import random
+
+        from PIL import ImageChops, JpegImagePlugin
+        gradient = Image.linear_gradient('L').resize((1600, 1200))
+        base = Image.merge('RGB', (
+            gradient,
+            gradient.transpose(Image.Transpose.ROTATE_90).resize((1600, 1200)),
+            gradient.transpose(Image.Transpose.FLIP_TOP_BOTTOM),
+        ))
+        rng = random.Random(0)
+        noise = Image.frombytes('RGB', (1600, 1200), rng.randbytes(1600 * 1200 * 3))
+        image = ImageChops.add(base, noise.point(lambda v: v // 5), 1.0, -25)
+        processor = CustomProcessor(max_size_mb=0.5, format='JPEG', strategy='quality')
+        max_size_bytes = 512 * 1024
+
+        # Even quality_min at 4:4:4 is over the limit
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=processor.quality_min, subsampling=0)
+        assert buffer.tell() > max_size_bytes
+
+        quality, data = processor._optimize_for_custom_size(image)
+
+        assert processor.quality_min <= quality <= processor.quality_start
+        assert len(data) <= max_size_bytes
+        assert JpegImagePlugin.get_sampling(Image.open(io.BytesIO(data))) == 2
+
+    @pytest.mark.parametrize('strategy', ['quality', 'size'])
+    def test_best_effort_encode(self, strategy):
+        """Test an image that can't fit is encoded baseline 4:2:0 at quality_min."""
+        import io
+        import random
+
+        from PIL import JpegImagePlugin
+        rng = random.Random(0)
+        image = Image.frombytes('RGB', (1600, 1200), rng.randbytes(1600 * 1200 * 3))
+        processor = CustomProcessor(max_size_mb=0.5, format='JPEG', strategy=strategy)
+
+        quality, data = processor._optimize_for_custom_size(image)
+
+        result = Image.open(io.BytesIO(data))
+        assert quality == processor.quality_min
+        assert len(data) > 0.5 * 1024 * 1024
+        assert 'progressive' not in result.info
+        assert JpegImagePlugin.get_sampling(result) == 2
+
+    def test_best_effort_kwargs_webp(self):
+        """Test the WebP best effort uses the highest method for either strategy."""
+        for strategy in ('quality', 'size'):
+            processor = CustomProcessor(format='WEBP', strategy=strategy)
+            save_kwargs = processor._best_effort_kwargs()
+            assert save_kwargs['method'] == 6
+            assert save_kwargs['quality'] == processor.quality_min
+
+    async def test_process_async(self):
+        """Test process_async encodes image bytes in a worker process."""
+        import io
+        processor = CustomProcessor(400, 300, 1.0, 'JPEG')
+        input_buffer = io.BytesIO()
+        image = Image.new('RGB', (1600, 1200), (100, 150, 200))
+        image.save(input_buffer, format='JPEG')
+
+        data = await processor.process_async(input_buffer.getvalue())
+
+        result = Image.open(io.BytesIO(data))
+        assert result.format == 'JPEG'
+        assert result.size == (400, 300)
+        assert len(data) <= 1024 * 1024
+
     def test_aspect_ratio_handling(self):
         """Test custom processor handles different aspect ratios."""
         processor = CustomProcessor(1000, 500, 2.0, 'JPEG')  # 2:1 ratio
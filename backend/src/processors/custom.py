@@ -1,31 +1,79 @@
+import asyncio
 import io
-from typing import Any, Literal, Optional
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache, lru_cache
+from typing import Any, BinaryIO, Literal, NamedTuple, Optional
 
-from PIL import Image, ImageFile
+from PIL import Image, ImageFile, features
 
 from .base import BaseProcessor
+from .optimization_utils import PROBE_OPTIMIZE, OptimizationUtils
 
 # Allow loading of truncated images
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
+
+class StrategyConfig(NamedTuple):
+    """Quality settings for one optimization strategy."""
+
+    quality_start: int
+    quality_min: int
+    progressive: bool
+    subsampling: int  # JPEG chroma subsampling, 0 = 4:4:4, 2 = 4:2:0
+    method: int  # WebP method
+    description: str
+
+
 # Strategy-based quality settings
 OPTIMIZATION_STRATEGIES = {
-    'quality': {
-        'quality_start': 95,
-        'quality_min': 80,
-        'progressive': True,
-        'method': 6,  # WebP method for better quality
-        'description': 'Prioritizes visual quality with higher compression settings'
-    },
-    'size': {
-        'quality_start': 75,
-        'quality_min': 45,
-        'progressive': False,
-        'method': 4,  # WebP method for better compression
-        'description': 'Prioritizes smaller file sizes with aggressive compression'
-    }
+    'quality': StrategyConfig(
+        quality_start=95,
+        quality_min=80,
+        progressive=True,
+        subsampling=0,  # Full-resolution color for the quality strategy
+        method=6,  # WebP method for better quality
+        description='Prioritizes visual quality with higher compression settings'
+    ),
+    'size': StrategyConfig(
+        quality_start=75,
+        quality_min=45,
+        progressive=False,
+        subsampling=2,
+        method=4,  # WebP method for better compression
+        description='Prioritizes smaller file sizes with aggressive compression'
+    )
 }
 
+# Rough bits per pixel of photographic content at high quality, used for
+# cheap fit checks before encoding
+HIGH_QUALITY_BITS_PER_PIXEL = {'JPEG': 4.0, 'WEBP': 2.5}
+
+# Bits per pixel reachable at quality_min (or, for PNG, with the palette
+# fallback) on easy content; a target needing fewer is rejected up front
+FORMAT_BPP_FLOOR = {'JPEG': 0.20, 'WEBP': 0.12, 'PNG': 1.0}
+
+# Above these pixel counts the encoders spend far more time for little size gain,
+# so the size search lowers the WebP method by 2 and the PNG zlib level to 6
+WEBP_REDUCED_EFFORT_PIXELS = 2_000_000
+PNG_REDUCED_EFFORT_PIXELS = 500_000
+
+# Palette quantizer for PNGs that exceed the size limit; libimagequant gives
+# the best palettes but is an optional Pillow build feature
+PNG_QUANTIZE_METHOD = (
+    Image.Quantize.LIBIMAGEQUANT
+    if features.check_feature('libimagequant')
+    else Image.Quantize.FASTOCTREE
+)
+
+# Resizes of images above this size are split into horizontal strips resampled
+# concurrently; Pillow releases the GIL while resampling
+PARALLEL_RESIZE_PIXELS = 4_000_000
+PARALLEL_RESIZE_MODES = ('RGB', 'RGBA', 'L')
+RESIZE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix='pixelprep-resize'
+)
+
 
 class CustomProcessor(BaseProcessor):
     """
@@ -82,17 +130,21 @@ class CustomProcessor(BaseProcessor):
             self.quality_min = max(10, quality - 20)  # Allow some reduction if needed
         else:
             # Use strategy-based quality
-            self.quality_start = strategy_config['quality_start']
-            self.quality_min = strategy_config['quality_min']
+            self.quality_start = strategy_config.quality_start
+            self.quality_min = strategy_config.quality_min
 
-        self.progressive = strategy_config['progressive']
-        self.webp_method = strategy_config['method']
+        self.progressive = strategy_config.progressive
+        self.subsampling = strategy_config.subsampling
+        self.webp_method = strategy_config.method
+        # save() kwargs templates by (format, probe, reduced effort, subsampling);
+        # see _size_search_kwargs
+        self._save_templates: dict[tuple[str, bool, bool, int], dict[str, Any]] = {}
 
         # Format-specific quality adjustments
         if self.format == 'PNG':
             # PNG is lossless, so quality settings don't apply
             self.quality_min = None
-        elif self.format == 'WebP':
+        elif self.format == 'WEBP':
             # WebP can use different quality ranges
             if strategy == 'size':
                 self.quality_min = max(30, self.quality_min - 10)
@@ -109,23 +161,24 @@ class CustomProcessor(BaseProcessor):
         """
         # Check for quality strategy with very small file size
         if (self.strategy == 'quality' and self.max_size_mb < 0.5 and
-            self.format in ['JPEG', 'WebP']):
+            self.format in ['JPEG', 'WEBP']):
             raise ValueError(
                 f"Impossible combination: 'Optimize for Quality' strategy cannot achieve "
                 f"file size under {self.max_size_mb}MB. Try 'Optimize for Size' strategy "
                 f"or increase the maximum file size to at least 1MB."
             )
 
-        # Check for PNG with very small file size (PNG is lossless)
-        if self.format == 'PNG' and self.max_size_mb < 1.0:
-            if self.target_width and self.target_height:
-                estimated_size = (self.target_width * self.target_height * 3) / (1024 * 1024)
-                if estimated_size > self.max_size_mb:
-                    raise ValueError(
-                        f"Impossible combination: PNG format with {self.target_width}×{self.target_height} "
-                        f"dimensions cannot achieve {self.max_size_mb}MB file size. "
-                        f"Try JPEG format or increase dimensions/file size limit."
-                    )
+        # Check the target dimensions can get under the limit at all
+        if self.target_width and self.target_height:
+            pixel_count = self.target_width * self.target_height
+            min_size_bytes = pixel_count * FORMAT_BPP_FLOOR.get(self.format, 1.0) / 8
+            if min_size_bytes > self.max_size_mb * 1024 * 1024 * 1.1:
+                raise ValueError(
+                    f"Impossible combination: {self.format} format with "
+                    f"{self.target_width}×{self.target_height} "
+                    f"dimensions cannot achieve {self.max_size_mb}MB file size. "
+                    f"Try a smaller size or increase the file size limit."
+                )
 
     def process(self, image: Image.Image) -> Image.Image:
         """
@@ -135,10 +188,10 @@ class CustomProcessor(BaseProcessor):
             image: Input PIL Image
 
         Returns:
-            Processed PIL Image with custom specifications
+            Processed PIL Image carrying its size-optimized encoding in info
         """
         # Fix orientation first for all formats
-        from .optimization_utils import OptimizationUtils
+        source = image
         image = OptimizationUtils.fix_image_orientation(image)
 
         # Handle different output formats
@@ -156,214 +209,520 @@ class CustomProcessor(BaseProcessor):
         processed_image = self._process_dimensions(image)
 
         # Optimize file size to meet constraints
-        optimized_image = self._optimize_for_custom_size(processed_image)
+        quality, data = self._optimize_for_custom_size(processed_image)
+
+        return OptimizationUtils.attach_encoding(processed_image, source, quality, data)
+
+    def get_decode_size(self, image_size: tuple[int, int]) -> tuple[int, int] | None:
+        """Decode just large enough for the planned output size."""
+        width, height = image_size
+        scale = 0.0
+        # EXIF orientation is applied after decoding, so plan for both layouts
+        for size in ((width, height), (height, width)):
+            target_size, crop_box = self._plan_dimensions(size)
+            left, top, right, bottom = crop_box or (0, 0, *size)
+            scale = max(
+                scale, target_size[0] / (right - left), target_size[1] / (bottom - top)
+            )
+        return self._scaled_decode_size(image_size, scale)
 
-        return optimized_image
+    async def process_async(self, image_bytes: bytes) -> bytes:
+        """
+        Process and encode image file content in a worker process.
+
+        Only bytes cross the process boundary; the worker decodes, processes
+        and encodes, so no PIL objects are pickled.
+
+        Args:
+            image_bytes: Encoded input image
+
+        Returns:
+            Encoded output image in the processor's format
+        """
+        future = _process_executor().submit(_process_bytes, self, image_bytes)
+        return await asyncio.wrap_future(future)
 
     def _process_dimensions(self, image: Image.Image) -> Image.Image:
         """
         Process image dimensions based on target settings.
 
+        The max_dimension cap and target dimensions are planned together, so
+        the original is cropped and resampled at most once.
+
         Args:
             image: Input PIL Image
 
         Returns:
             Resized PIL Image
         """
-        current_width, current_height = image.size
+        target_size, crop_box = self._plan_dimensions(image.size)
 
-        # Handle max_dimension constraint
+        if crop_box is None:
+            if target_size == image.size:
+                return image
+        elif (crop_box[2] - crop_box[0], crop_box[3] - crop_box[1]) == target_size:
+            return image.crop(crop_box)
+
+        return self._resize_with_quality(image, *target_size, box=crop_box)
+
+    def _plan_dimensions(
+        self, image_size: tuple[int, int]
+    ) -> tuple[tuple[int, int], Optional[tuple[int, int, int, int]]]:
+        """Get the output size and the source crop box (or None) for an image size."""
+        current_width, current_height = image_size
+
+        # Handle max_dimension constraint as a cap on the planned size
         if self.max_dimension:
             max_side = max(current_width, current_height)
             if max_side > self.max_dimension:
                 # Scale down proportionally
                 scale_factor = self.max_dimension / max_side
-                new_width = int(current_width * scale_factor)
-                new_height = int(current_height * scale_factor)
-                image = self._resize_with_quality(image, new_width, new_height)
-                current_width, current_height = new_width, new_height
+                current_width = int(current_width * scale_factor)
+                current_height = int(current_height * scale_factor)
+
+        target_size = (current_width, current_height)
+        crop_box = None
 
         # Handle specific target dimensions
         if self.target_width and self.target_height:
-            if image.size != (self.target_width, self.target_height):
+            if target_size != (self.target_width, self.target_height):
                 target_ratio = self.target_width / self.target_height
                 current_ratio = current_width / current_height
 
                 if abs(target_ratio - current_ratio) > 0.1:  # Different aspect ratios
-                    # Smart crop to match aspect ratio, then resize to target dimensions
-                    image = self._smart_crop(image, self.target_width, self.target_height)
-                    image = self._resize_with_quality(image, self.target_width, self.target_height)
-                else:
-                    # Similar aspect ratios, just resize
-                    image = self._resize_with_quality(image, self.target_width, self.target_height)
+                    # Smart crop the original to match aspect ratio
+                    crop_box = self._center_crop_box(
+                        image_size, self.target_width, self.target_height
+                    )
+                # Otherwise similar aspect ratios, just resize
+                target_size = (self.target_width, self.target_height)
         elif self.target_width and not self.target_height:
             # Scale to target width, maintain aspect ratio
             aspect_ratio = current_height / current_width
-            new_height = int(self.target_width * aspect_ratio)
-            image = self._resize_with_quality(image, self.target_width, new_height)
+            target_size = (self.target_width, int(self.target_width * aspect_ratio))
         elif self.target_height and not self.target_width:
             # Scale to target height, maintain aspect ratio
             aspect_ratio = current_width / current_height
-            new_width = int(self.target_height * aspect_ratio)
-            image = self._resize_with_quality(image, new_width, self.target_height)
+            target_size = (int(self.target_height * aspect_ratio), self.target_height)
 
-        return image
+        return target_size, crop_box
 
-    def get_preset_config(self) -> dict[str, Any]:
-        """Get custom processor configuration."""
-        # Build dimension description
-        if self.target_width and self.target_height:
-            dimensions = f'{self.target_width}×{self.target_height}px'
-            aspect_ratio = f'{self.target_width/self.target_height:.2f}:1'
-        elif self.max_dimension:
-            dimensions = f'Max {self.max_dimension}px (proportional)'
-            aspect_ratio = 'Original'
-        else:
-            dimensions = 'Original dimensions'
-            aspect_ratio = 'Original'
+    def _resize_with_quality(
+        self,
+        image: Image.Image,
+        target_width: int,
+        target_height: int,
+        box: tuple[int, int, int, int] | None = None,
+    ) -> Image.Image:
+        """Resize like the base class, resampling large images in parallel strips."""
+        strips = min(os.cpu_count() or 1, target_height)
+        if (
+            strips < 2
+            or image.mode not in PARALLEL_RESIZE_MODES
+            or image.size[0] * image.size[1] <= PARALLEL_RESIZE_PIXELS
+        ):
+            return super()._resize_with_quality(image, target_width, target_height, box)
+        return self._resize_in_strips(image, target_width, target_height, box, strips)
+
+    def _resize_in_strips(
+        self,
+        image: Image.Image,
+        target_width: int,
+        target_height: int,
+        box: tuple[int, int, int, int] | None,
+        strips: int,
+    ) -> Image.Image:
+        """
+        Resize in horizontal output strips on RESIZE_EXECUTOR.
 
-        strategy_info = OPTIMIZATION_STRATEGIES[self.strategy]
+        Each strip resamples its slice of the source box from the whole image,
+        so the kernel reaches across strip edges and the result is identical
+        to BaseProcessor._resize_with_quality.
 
-        return {
-            'name': f'Custom ({self.strategy.title()})',
-            'description': f'{strategy_info["description"]} - {dimensions}',
-            'dimensions': dimensions,
-            'max_file_size': f'<{self.max_size_mb}MB',
-            'format': self.format,
-            'aspect_ratio': aspect_ratio,
-            'strategy': self.strategy,
-            'use_case': f'Custom optimization prioritizing {self.strategy}',
-            'customizable': True
-        }
+        Args:
+            image: PIL Image to resize
+            target_width: Output width
+            target_height: Output height
+            box: Source region to resize, or None for the whole image
+            strips: Number of strips to resample concurrently
+
+        Returns:
+            Resized PIL Image
+        """
+        left, top, right, bottom = box or (0, 0, *image.size)
+        ratio = max((right - left) / target_width, (bottom - top) / target_height)
+
+        if ratio < 2.0:
+            resample = Image.Resampling.BICUBIC
+        else:
+            resample = Image.Resampling.LANCZOS
+            # Apply the integer pre-reduction of reducing_gap=2.0 once, up front
+            factor_x = max(int((right - left) / target_width / 2.0), 1)
+            factor_y = max(int((bottom - top) / target_height / 2.0), 1)
+            if factor_x > 1 or factor_y > 1:
+                image = image.reduce((factor_x, factor_y))
+                left, right = left / factor_x, right / factor_x
+                top, bottom = top / factor_y, bottom / factor_y
+
+        # Decode before the strips read it concurrently
+        image.load()
+        row_step = (bottom - top) / target_height
+
+        def resize_strip(index: int) -> tuple[int, Image.Image]:
+            strip_top = target_height * index // strips
+            strip_bottom = target_height * (index + 1) // strips
+            strip = image.resize(
+                (target_width, strip_bottom - strip_top),
+                resample,
+                box=(
+                    left,
+                    top + strip_top * row_step,
+                    right,
+                    top + strip_bottom * row_step,
+                ),
+            )
+            return strip_top, strip
 
-    def _optimize_for_custom_size(self, image: Image.Image) -> Image.Image:
+        result = Image.new(image.mode, (target_width, target_height))
+        for strip_top, strip in RESIZE_EXECUTOR.map(resize_strip, range(strips)):
+            result.paste(strip, (0, strip_top))
+        return result
+
+    def get_preset_config(self) -> dict[str, Any]:
+        """Get custom processor configuration."""
+        # Shallow copy so callers can't mutate the cached config
+        return dict(_build_preset_config(
+            self.strategy,
+            self.format,
+            self.target_width,
+            self.target_height,
+            self.max_dimension,
+            self.max_size_mb,
+        ))
+
+    def _optimize_for_custom_size(
+        self, image: Image.Image
+    ) -> tuple[Optional[int], bytes]:
         """
         Optimize image to meet custom file size requirements.
-        
+
+        Encoded size grows with quality, so the highest fitting quality in
+        [quality_min, quality_start] is found by bisection in at most
+        log2(range) + 1 encodes rather than one encode per 5-point step.
+        A 4:4:4 JPEG that fits at no quality is searched again at 4:2:0.
+
         Args:
             image: PIL Image to optimize
-            
+
         Returns:
-            Optimized PIL Image
+            Tuple of (chosen quality or None for PNG, encoded image bytes)
         """
         max_size_bytes = int(self.max_size_mb * 1024 * 1024)
-        quality = self.quality_start
 
-        while quality >= (self.quality_min or 0):
-            output_buffer = io.BytesIO()
+        if self.format == 'PNG':
+            return self._encode_png_once(image, max_size_bytes)
+
+        # Most uploads fit easily at quality_start; when the estimate says so,
+        # probe it first so a fit ends the search after one encode
+        first_quality = None
+        if self._predicted_size(image.size) <= max_size_bytes * 0.7:
+            first_quality = self.quality_start
+
+        try:
+            result = self._bisect_quality(image, max_size_bytes, first_quality)
+        except (OSError, NotImplementedError):
+            # Handle format not supported
+            if self.format != 'WEBP':
+                raise
+            # Fallback to JPEG and restart the search
+            image = self._fall_back_to_jpeg(image)
+            result = self._bisect_quality(image, max_size_bytes, first_quality)
+
+        if result is None and self.format == 'JPEG' and self.subsampling != 2:
+            # 4:4:4 chroma is a fidelity preference, not worth missing the limit over
+            result = self._bisect_quality(image, max_size_bytes, None, subsampling=2)
+
+        if result is not None:
+            return result
 
-            # Format-specific optimization
-            save_kwargs = {
-                'format': self.format,
-                'optimize': True
-            }
+        # If we can't meet size requirements, return best effort
+        output_buffer = io.BytesIO()
+        image.save(output_buffer, **self._best_effort_kwargs())
+        return self.quality_min, output_buffer.getvalue()
 
-            if self.format == 'JPEG':
-                save_kwargs.update({
-                    'quality': quality,
-                    'progressive': self.progressive
-                })
-            elif self.format == 'WebP':
-                save_kwargs.update({
-                    'quality': quality,
-                    'method': self.webp_method,
-                    'lossless': False
-                })
-            elif self.format == 'PNG':
-                save_kwargs.update({
-                    'compress_level': 9,  # Maximum PNG compression
-                    'optimize': True
-                })
-                # PNG doesn't use quality parameter
+    def _bisect_quality(
+        self,
+        image: Image.Image,
+        max_size_bytes: int,
+        first_quality: Optional[int],
+        subsampling: Optional[int] = None,
+    ) -> Optional[tuple[int, bytes]]:
+        """
+        Bisect for the highest quality whose encode fits max_size_bytes.
 
-            try:
-                image.save(output_buffer, **save_kwargs)
-                file_size = output_buffer.tell()
+        Args:
+            image: PIL Image to encode
+            max_size_bytes: Maximum file size in bytes
+            first_quality: Quality to probe before bisecting, or None
+            subsampling: JPEG chroma subsampling, defaults to the strategy's
 
-                # If file size is acceptable, return the image
-                if file_size <= max_size_bytes:
-                    output_buffer.seek(0)
-                    return Image.open(output_buffer)
+        Returns:
+            Tuple of (quality, encoded image bytes), or None if nothing fits
+        """
+        low, high = self.quality_min, self.quality_start
+        best_quality = best_buffer = None
+        # Probes reuse a scratch buffer; a fitting probe swaps it with the best one
+        output_buffer = io.BytesIO()
 
-                # For PNG, we can't reduce quality, so break
-                if self.format == 'PNG':
-                    break
+        quality = first_quality
+        while low <= high:
+            if quality is None:
+                quality = (low + high) // 2
+            output_buffer.seek(0)
+            output_buffer.truncate()
+            image.save(
+                output_buffer,
+                **self._size_search_kwargs(
+                    quality, image.size, probe=True, subsampling=subsampling
+                ),
+            )
 
-                quality -= 5
+            if output_buffer.tell() <= max_size_bytes:
+                best_quality = quality
+                best_buffer, output_buffer = output_buffer, best_buffer or io.BytesIO()
+                low = quality + 1
+            else:
+                high = quality - 1
+            quality = None
+
+        if best_buffer is None:
+            return None
+
+        if self.format == 'JPEG' and not self._near_quality_floor(best_quality):
+            # One Huffman-optimized encode at the winning quality; it is never
+            # larger than the unoptimized baseline probe that fit. Near the
+            # floor the fitting probe is kept as is to bound latency.
+            best_buffer.seek(0)
+            best_buffer.truncate()
+            image.save(
+                best_buffer,
+                **self._size_search_kwargs(
+                    best_quality, image.size, subsampling=subsampling
+                ),
+            )
+        # A WebP probe is already the final encode
+        return best_quality, best_buffer.getvalue()
 
-            except (OSError, NotImplementedError) as e:
-                # Handle format not supported
-                if self.format == 'WebP':
-                    # Fallback to JPEG
-                    self.format = 'JPEG'
-                    continue
-                else:
-                    raise e
+    def _best_effort_kwargs(self) -> dict[str, Any]:
+        """
+        Get save() kwargs for the encode used when no quality fits the limit.
 
-        # If we can't meet size requirements, return best effort
-        output_buffer = io.BytesIO()
+        Independent of the strategy's settings: the output is already over the
+        limit, so it is encoded as small as possible at quality_min (baseline
+        4:2:0 JPEG, WebP at the highest method).
+
+        Returns:
+            Dictionary with PIL Image.save() parameters
+        """
         save_kwargs = {
             'format': self.format,
+            'quality': self.quality_min,
             'optimize': True
         }
 
         if self.format == 'JPEG':
             save_kwargs.update({
-                'quality': self.quality_min,
-                'progressive': False
+                'progressive': False,
+                'subsampling': 2
             })
-        elif self.format == 'WebP':
+        elif self.format == 'WEBP':
             save_kwargs.update({
-                'quality': self.quality_min,
                 'method': 6,
                 'lossless': False
             })
-        elif self.format == 'PNG':
+
+        return save_kwargs
+
+    def _near_quality_floor(self, quality: Optional[int]) -> bool:
+        """Whether a 'size' encode is near enough quality_min to skip extra effort."""
+        return (
+            self.strategy == 'size'
+            and quality is not None
+            and quality <= self.quality_min + 5
+        )
+
+    def _fall_back_to_jpeg(self, image: Image.Image) -> Image.Image:
+        """Switch output to JPEG when WebP can't be encoded; returns the RGB image."""
+        self.format = 'JPEG'
+        # WebP keeps alpha, which JPEG can't encode; convert once for the whole search
+        return self._ensure_rgb(image)
+
+    def _predicted_size(self, image_size: tuple[int, int]) -> float:
+        """Estimate the high-quality encoded size in bytes from the pixel count."""
+        bits_per_pixel = HIGH_QUALITY_BITS_PER_PIXEL.get(self.format, 24)
+        return image_size[0] * image_size[1] * bits_per_pixel / 8
+
+    def _encode_png_once(
+        self, image: Image.Image, max_size_bytes: int
+    ) -> tuple[None, bytes]:
+        """
+        Encode PNG in a single pass, falling back to a 256-color palette.
+
+        PNG is lossless, so there is no quality to search: one encode at the
+        size-scaled zlib level is the best we can do. If that exceeds the
+        limit, the image is quantized to a palette and encoded once more.
+
+        Args:
+            image: PIL Image to encode
+            max_size_bytes: Maximum file size in bytes
+
+        Returns:
+            Tuple of (None for quality, encoded PNG bytes)
+        """
+        save_kwargs = self._size_search_kwargs(None, image.size)
+        output_buffer = io.BytesIO()
+        image.save(output_buffer, **save_kwargs)
+        if output_buffer.tell() <= max_size_bytes or image.mode in ('P', '1'):
+            return None, output_buffer.getvalue()
+
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+        quantized = image.quantize(colors=256, method=PNG_QUANTIZE_METHOD)
+        output_buffer = io.BytesIO()
+        quantized.save(output_buffer, **save_kwargs)
+        return None, output_buffer.getvalue()
+
+    def _size_search_kwargs(
+        self,
+        quality: Optional[int],
+        image_size: tuple[int, int],
+        probe: bool = False,
+        subsampling: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """
+        Get save() kwargs for one size-search encode.
+
+        Encoder effort is scaled to the image: large images get a lower WebP
+        method and PNG zlib level (see WEBP/PNG_REDUCED_EFFORT_PIXELS). WebP
+        encodes near the 'size' strategy's quality floor get the lower method too.
+
+        Args:
+            quality: Quality level for lossy formats (ignored for PNG)
+            image_size: (width, height) of the image being encoded
+            probe: Whether this is a JPEG size probe, encoded baseline without
+                Huffman optimization (see PROBE_OPTIMIZE)
+            subsampling: JPEG chroma subsampling, defaults to the strategy's
+
+        Returns:
+            Dictionary with PIL Image.save() parameters
+        """
+        if subsampling is None:
+            subsampling = self.subsampling
+        pixel_count = image_size[0] * image_size[1]
+        if self.format == 'PNG':
+            reduced_effort = pixel_count >= PNG_REDUCED_EFFORT_PIXELS
+        else:
+            reduced_effort = (
+                pixel_count >= WEBP_REDUCED_EFFORT_PIXELS
+                or self._near_quality_floor(quality)
+            )
+
+        # Only quality varies between encodes, so the rest is built once per variant
+        key = (self.format, probe, reduced_effort, subsampling)
+        template = self._save_templates.get(key)
+        if template is None:
+            template = self._save_templates[key] = self._build_save_template(
+                probe, reduced_effort, subsampling
+            )
+
+        save_kwargs = template.copy()
+        if self.format != 'PNG':
+            # PNG doesn't use quality parameter
+            save_kwargs['quality'] = quality
+        return save_kwargs
+
+    def _build_save_template(
+        self, probe: bool, reduced_effort: bool, subsampling: int
+    ) -> dict[str, Any]:
+        """Build the quality-independent save() kwargs for _size_search_kwargs."""
+        # Format-specific optimization
+        save_kwargs = {
+            'format': self.format,
+            'optimize': True
+        }
+
+        if self.format == 'JPEG':
             save_kwargs.update({
-                'compress_level': 9
+                'progressive': self.progressive and not probe,
+                'subsampling': subsampling
             })
+            if probe:
+                save_kwargs['optimize'] = PROBE_OPTIMIZE
+        elif self.format == 'WEBP':
+            save_kwargs.update({
+                'method': (
+                    max(self.webp_method - 2, 2) if reduced_effort else self.webp_method
+                ),
+                'lossless': False
+            })
+        elif self.format == 'PNG':
+            if not reduced_effort:
+                save_kwargs.update({
+                    'compress_level': 9,  # Maximum PNG compression
+                    'optimize': True
+                })
+            else:
+                # Pillow's PNG optimize forces level 9, so it has to be off here
+                save_kwargs.update({
+                    'compress_level': 6,
+                    'optimize': False
+                })
 
-        image.save(output_buffer, **save_kwargs)
-        output_buffer.seek(0)
-        return Image.open(output_buffer)
+        return save_kwargs
 
-    def save_optimized(self, image: Image.Image, output_path: str) -> dict[str, Any]:
+    def _search_and_encode(
+        self, image: Image.Image, max_size_bytes: int
+    ) -> tuple[Optional[int], bytes]:
         """
-        Save custom optimized image and return metadata.
-        
+        Find quality settings for an image that did not come through process().
+
         Args:
-            image: Processed PIL Image
-            output_path: Path to save the image
-            
+            image: PIL Image to encode
+            max_size_bytes: Maximum file size in bytes
+
         Returns:
-            Dictionary with save metadata
+            Tuple of (final quality or None for PNG, encoded image bytes)
         """
-        max_size_bytes = int(self.max_size_mb * 1024 * 1024)
+        if self.format == 'PNG':
+            return self._encode_png_once(image, max_size_bytes)
+
         quality = self.quality_start
         final_quality = quality
 
-        # Find optimal settings for target file size
-        while quality >= (self.quality_min or 0):
-            test_buffer = io.BytesIO()
+        # Find optimal settings for target file size, reusing one probe buffer
+        test_buffer = io.BytesIO()
+        while quality >= self.quality_min:
+            test_buffer.seek(0)
+            test_buffer.truncate()
             save_kwargs = {
                 'format': self.format,
                 'optimize': True
             }
 
             if self.format == 'JPEG':
+                # Baseline probes skip Huffman optimization (see PROBE_OPTIMIZE)
                 save_kwargs.update({
                     'quality': quality,
-                    'progressive': True if quality > 80 else False
+                    'optimize': PROBE_OPTIMIZE,
+                    'progressive': False,
+                    'subsampling': self.subsampling
                 })
-            elif self.format == 'WebP':
+            elif self.format == 'WEBP':
                 save_kwargs.update({
                     'quality': quality,
                     'method': 6,
                     'lossless': False
                 })
-            elif self.format == 'PNG':
-                save_kwargs['compress_level'] = 9
-                quality = None  # PNG doesn't use quality
 
             try:
                 image.save(test_buffer, **save_kwargs)
@@ -373,49 +732,68 @@ class CustomProcessor(BaseProcessor):
                     final_quality = quality
                     break
 
-                if self.format == 'PNG':
-                    break  # Can't reduce PNG quality
-
                 quality -= 5
 
             except (OSError, NotImplementedError):
                 # Format fallback
-                if self.format == 'WebP':
-                    self.format = 'JPEG'
+                if self.format == 'WEBP':
+                    image = self._fall_back_to_jpeg(image)
                     continue
                 break
 
-        # Save with optimal settings
+        # Save with optimal settings; near the 'size' floor the Huffman pass is skipped
         save_kwargs = {
             'format': self.format,
-            'optimize': True
+            'optimize': not self._near_quality_floor(final_quality)
         }
 
         if self.format == 'JPEG':
             save_kwargs.update({
                 'quality': final_quality or self.quality_min,
-                'progressive': self.progressive
+                'progressive': self.progressive,
+                'subsampling': self.subsampling
             })
-        elif self.format == 'WebP':
+        elif self.format == 'WEBP':
             save_kwargs.update({
                 'quality': final_quality or self.quality_min,
                 'method': self.webp_method,
                 'lossless': False
             })
-        elif self.format == 'PNG':
-            save_kwargs['compress_level'] = 9
 
-        image.save(output_path, **save_kwargs)
+        output_buffer = io.BytesIO()
+        image.save(output_buffer, **save_kwargs)
+        return final_quality, output_buffer.getvalue()
 
-        # Return metadata
-        import os
-        file_size = os.path.getsize(output_path)
+    def save_optimized(
+        self, image: Image.Image, output_path: str | BinaryIO
+    ) -> dict[str, Any]:
+        """
+        Save custom optimized image and return metadata.
 
+        Args:
+            image: Processed PIL Image
+            output_path: Path or binary buffer to save the image to
+
+        Returns:
+            Dictionary with save metadata
+        """
+        max_size_bytes = int(self.max_size_mb * 1024 * 1024)
+
+        encoding = OptimizationUtils.pop_encoding(image)
+        if encoding is not None:
+            final_quality = encoding['quality']
+            data = encoding['data']
+        else:
+            final_quality, data = self._search_and_encode(image, max_size_bytes)
+
+        file_size = OptimizationUtils.write_encoded(output_path, data)
+
+        # Return metadata
         metadata = {
-            'file_path': output_path,
+            'file_path': OptimizationUtils.get_output_file_path(output_path),
             'file_size_bytes': file_size,
             'file_size_mb': round(file_size / (1024 * 1024), 2),
-            'dimensions': f'{image.size[0]}×{image.size[1]}',
+            'dimensions': f'{image.size[0]}x{image.size[1]}',
             'format': self.format,
             'meets_size_requirement': file_size <= max_size_bytes,
             'custom_width': self.target_width,
@@ -424,8 +802,11 @@ class CustomProcessor(BaseProcessor):
         }
 
         # Add quality info for lossy formats
-        if self.format in ['JPEG', 'WebP'] and final_quality:
+        if self.format in ['JPEG', 'WEBP'] and final_quality:
             metadata['quality'] = final_quality
+        elif self.format == 'PNG' and image.mode != 'P':
+            # Only the header is parsed to see whether the palette fallback ran
+            metadata['palette_reduced'] = Image.open(io.BytesIO(data)).mode == 'P'
 
         return metadata
 
@@ -456,7 +837,7 @@ class CustomProcessor(BaseProcessor):
                 'progressive': self.progressive,
                 'optimize': True
             }
-        elif self.format == 'WebP':
+        elif self.format == 'WEBP':
             return {
                 'format': self.format,
                 'quality': adjusted_quality,
@@ -479,6 +860,64 @@ class CustomProcessor(BaseProcessor):
             }
 
 
+@lru_cache(maxsize=128)
+def _build_preset_config(
+    strategy: str,
+    format: str,
+    target_width: Optional[int],
+    target_height: Optional[int],
+    max_dimension: Optional[int],
+    max_size_mb: float
+) -> dict[str, Any]:
+    """
+    Build the custom processor configuration for one set of parameters.
+
+    Cached because a CustomProcessor is created per request and most requests
+    repeat a handful of parameter combinations. Callers must copy the result.
+    """
+    # Build dimension description
+    if target_width and target_height:
+        dimensions = f'{target_width}×{target_height}px'
+        aspect_ratio = f'{target_width/target_height:.2f}:1'
+    elif max_dimension:
+        dimensions = f'Max {max_dimension}px (proportional)'
+        aspect_ratio = 'Original'
+    else:
+        dimensions = 'Original dimensions'
+        aspect_ratio = 'Original'
+
+    strategy_info = OPTIMIZATION_STRATEGIES[strategy]
+
+    return {
+        'name': f'Custom ({strategy.title()})',
+        'description': f'{strategy_info.description} - {dimensions}',
+        'dimensions': dimensions,
+        'max_file_size': f'<{max_size_mb}MB',
+        'format': format,
+        'aspect_ratio': aspect_ratio,
+        'strategy': strategy,
+        'use_case': f'Custom optimization prioritizing {strategy}',
+        'customizable': True
+    }
+
+
+@cache
+def _process_executor() -> ProcessPoolExecutor:
+    """Get the process pool for process_async(), created on first use."""
+    return ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+def _process_bytes(processor: CustomProcessor, image_bytes: bytes) -> bytes:
+    """Decode, process and encode image bytes; runs in a process_async() worker."""
+    image = Image.open(io.BytesIO(image_bytes))
+    # Let JPEG decode at a reduced scale when the processor shrinks the image anyway
+    decode_size = processor.get_decode_size(image.size)
+    if decode_size:
+        image.draft(image.mode, decode_size)
+    processed_image = processor.process(image)
+    return OptimizationUtils.pop_encoding(processed_image)['data']
+
+
 # Factory function for creating custom processors
 def create_custom_processor(
     width: Optional[int] = None,
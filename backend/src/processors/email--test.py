@@ -54,7 +54,7 @@ class TestEmailNewsletterProcessor:
             metadata = self.processor.save_optimized(image, tmp.name)
 
             assert metadata['format'] == 'JPEG'
-            assert metadata['dimensions'] == '600×400'
+            assert metadata['dimensions'] == '600x400'
             assert metadata['file_size_kb'] <= 200
             assert metadata['email_friendly'] is True
             assert metadata['mobile_optimized'] is True
@@ -62,3 +62,38 @@ class TestEmailNewsletterProcessor:
             # Verify file exists
             saved_image = Image.open(tmp.name)
             assert saved_image.size == (600, 400)
+
+    def test_save_optimized_picks_highest_fitting_quality(self):
+        """Test the search lands on the highest 5-point step whose probe fits."""
+        import io
+        image = Image.effect_noise((600, 800), 60).convert('RGB')
+
+        buffer = io.BytesIO()
+        metadata = self.processor.save_optimized(image, buffer)
+        quality = metadata['quality']
+
+        assert metadata['meets_email_requirements'] is True
+        assert (EmailNewsletterProcessor.QUALITY_START - quality) % 5 == 0
+        assert quality < EmailNewsletterProcessor.QUALITY_START
+
+        next_step = io.BytesIO()
+        image.save(
+            next_step,
+            format='JPEG',
+            quality=quality + 5,
+            optimize=False,
+            progressive=False,
+        )
+        assert next_step.tell() > EmailNewsletterProcessor.MAX_FILE_SIZE_KB * 1024
+
+    def test_save_optimized_falls_back_to_minimum_quality(self):
+        """Test an image that fits at no quality is saved at QUALITY_MIN."""
+        import io
+        import random
+        rng = random.Random(0)
+        image = Image.frombytes('RGB', (600, 2000), rng.randbytes(600 * 2000 * 3))
+
+        metadata = self.processor.save_optimized(image, io.BytesIO())
+
+        assert metadata['meets_email_requirements'] is False
+        assert metadata['quality'] == EmailNewsletterProcessor.QUALITY_MIN
@@ -1,9 +1,10 @@
 import io
-from typing import Any
+from typing import Any, BinaryIO
 
 from PIL import Image, ImageFile
 
 from .base import BaseProcessor
+from .optimization_utils import PROBE_OPTIMIZE, OptimizationUtils
 
 # Allow loading of truncated images
 ImageFile.LOAD_TRUNCATED_IMAGES = True
@@ -26,18 +27,23 @@ class EmailNewsletterProcessor(BaseProcessor):
             image: Input PIL Image
             
         Returns:
-            Processed PIL Image optimized for email newsletters
+            Processed PIL Image carrying its email-optimized encoding in info
         """
         # Fix orientation and ensure RGB mode for JPEG output
+        source = image
         image = self._fix_orientation_and_ensure_rgb(image)
 
         # Resize to target width while preserving aspect ratio
         resized_image = self._resize_to_width(image, self.TARGET_WIDTH)
 
         # Optimize file size for email delivery
-        optimized_image = self._optimize_for_email(resized_image)
+        quality, data = self._optimize_for_email(resized_image)
 
-        return optimized_image
+        return OptimizationUtils.attach_encoding(resized_image, source, quality, data)
+
+    def get_decode_size(self, image_size: tuple[int, int]) -> tuple[int, int] | None:
+        """Decode large enough for the target width on either side (EXIF may rotate)."""
+        return self._scaled_decode_size(image_size, self.TARGET_WIDTH / min(image_size))
 
     def get_preset_config(self) -> dict[str, Any]:
         """Get email newsletter preset configuration."""
@@ -67,7 +73,7 @@ class EmailNewsletterProcessor(BaseProcessor):
 
         return self._resize_with_quality(image, target_width, new_height)
 
-    def _optimize_for_email(self, image: Image.Image) -> Image.Image:
+    def _optimize_for_email(self, image: Image.Image) -> tuple[int, bytes]:
         """
         Optimize image for email delivery with strict size constraints.
         
@@ -75,96 +81,59 @@ class EmailNewsletterProcessor(BaseProcessor):
             image: PIL Image to optimize
             
         Returns:
-            Optimized PIL Image
+            Tuple of (chosen quality, encoded JPEG bytes)
         """
         max_size_bytes = self.MAX_FILE_SIZE_KB * 1024
-        quality = self.QUALITY_START
-
-        while quality >= self.QUALITY_MIN:
-            output_buffer = io.BytesIO()
-
-            # Save with current quality, optimized for email
-            save_kwargs = {
-                'format': self.FORMAT,
-                'quality': quality,
-                'optimize': True,
-                'progressive': False  # Progressive JPEGs can be problematic in email
-            }
-
-            image.save(output_buffer, **save_kwargs)
-            file_size = output_buffer.tell()
-
-            # If file size is acceptable, return the image
-            if file_size <= max_size_bytes:
-                output_buffer.seek(0)
-                return Image.open(output_buffer)
 
-            # Reduce quality and try again
-            quality -= 5
+        # Bisect the quality; probes skip Huffman optimization (see PROBE_OPTIMIZE)
+        save_kwargs = {
+            'format': self.FORMAT,
+            'optimize': PROBE_OPTIMIZE,
+            'progressive': False  # Progressive JPEGs can be problematic in email
+        }
+        quality, _ = OptimizationUtils.search_quality(
+            image, max_size_bytes, save_kwargs, self.QUALITY_START, self.QUALITY_MIN
+        )
 
-        # If we can't meet size requirements, return with minimum quality
+        # Encode once, optimized, at the chosen quality, or at minimum quality
+        # if we can't meet size requirements
+        quality = quality or self.QUALITY_MIN
         output_buffer = io.BytesIO()
-        image.save(
-            output_buffer,
-            format=self.FORMAT,
-            quality=self.QUALITY_MIN,
-            optimize=True,
-            progressive=False
-        )
-        output_buffer.seek(0)
-        return Image.open(output_buffer)
+        image.save(output_buffer, **self.get_compression_params(quality))
+        return quality, output_buffer.getvalue()
 
-    def save_optimized(self, image: Image.Image, output_path: str) -> dict[str, Any]:
+    def save_optimized(
+        self, image: Image.Image, output_path: str | BinaryIO
+    ) -> dict[str, Any]:
         """
         Save optimized image for email newsletter and return metadata.
         
         Args:
             image: Processed PIL Image
-            output_path: Path to save the image
+            output_path: Path or binary buffer to save the image to
             
         Returns:
             Dictionary with save metadata
         """
-        # Find optimal quality for target file size
         max_size_bytes = self.MAX_FILE_SIZE_KB * 1024
-        quality = self.QUALITY_START
-        final_quality = quality
-
-        while quality >= self.QUALITY_MIN:
-            test_buffer = io.BytesIO()
-            image.save(
-                test_buffer,
-                format=self.FORMAT,
-                quality=quality,
-                optimize=True,
-                progressive=False
-            )
-            file_size = test_buffer.tell()
-
-            if file_size <= max_size_bytes:
-                final_quality = quality
-                break
-            quality -= 5
-
-        # Save with optimal settings
-        save_kwargs = {
-            'format': self.FORMAT,
-            'quality': final_quality,
-            'optimize': True,
-            'progressive': False  # Better email compatibility
-        }
 
-        image.save(output_path, **save_kwargs)
+        encoding = OptimizationUtils.pop_encoding(image)
+        if encoding is not None:
+            final_quality = encoding['quality']
+            data = encoding['data']
+        else:
+            # Find optimal quality for target file size
+            final_quality, data = self._optimize_for_email(image)
+
+        file_size = OptimizationUtils.write_encoded(output_path, data)
 
         # Return metadata
-        import os
-        file_size = os.path.getsize(output_path)
         return {
-            'file_path': output_path,
+            'file_path': OptimizationUtils.get_output_file_path(output_path),
             'file_size_bytes': file_size,
             'file_size_kb': round(file_size / 1024, 1),
             'quality': final_quality,
-            'dimensions': f'{image.size[0]}×{image.size[1]}',
+            'dimensions': f'{image.size[0]}x{image.size[1]}',
             'format': self.FORMAT,
             'meets_email_requirements': file_size <= max_size_bytes,
             'email_friendly': True,  # Non-progressive JPEG
@@ -64,6 +64,17 @@ class TestInstagramSquareProcessor:
         assert result.size == (1080, 1080)
         assert result.mode == 'RGB'
 
+    def test_process_grayscale_image(self):
+        """Test grayscale input gives the same result converted after the resize."""
+        from PIL import ImageChops
+        image = Image.effect_mandelbrot((1600, 1200), (-2, -1.2, 1, 1.2), 100)
+
+        result = self.processor.process(image)
+        expected = self.processor._crop_and_resize(image.convert('RGB'), 1080, 1080)
+
+        assert result.mode == 'RGB'
+        assert ImageChops.difference(result, expected).getbbox() is None
+
     def test_process_small_image_upscales(self):
         """Test that small images are upscaled to target size."""
         # Create small square image
@@ -76,15 +87,16 @@ class TestInstagramSquareProcessor:
 
     def test_optimize_file_size(self):
         """Test file size optimization."""
-        # Create large image that will need compression
-        image = Image.new('RGB', (1080, 1080))
+        from PIL import ImageChops
 
-        # Fill with complex pattern to increase file size
-        pixels = []
-        for y in range(1080):
-            for x in range(1080):
-                pixels.append((x % 256, y % 256, (x + y) % 256))
-        image.putdata(pixels)
+        # Create large image that will need compression, filled with the
+        # complex pattern (x % 256, y % 256, (x + y) % 256) to increase file size;
+        # one ramp row/column stretched with NEAREST avoids per-pixel Python work
+        ramp = bytes(i % 256 for i in range(1080))
+        nearest = Image.Resampling.NEAREST
+        red = Image.frombytes('L', (1080, 1), ramp).resize((1080, 1080), nearest)
+        green = Image.frombytes('L', (1, 1080), ramp).resize((1080, 1080), nearest)
+        image = Image.merge('RGB', (red, green, ImageChops.add_modulo(red, green)))
 
         optimized = self.processor.optimize_file_size(image, max_size_bytes=4*1024*1024)
 
@@ -107,7 +119,7 @@ class TestInstagramSquareProcessor:
 
             assert metadata['file_path'] == tmp.name
             assert metadata['file_size_mb'] <= 4.0
-            assert metadata['dimensions'] == '1080×1080'
+            assert metadata['dimensions'] == '1080x1080'
             assert metadata['format'] == 'JPEG'
             assert 60 <= metadata['quality'] <= 95
 
@@ -115,6 +127,28 @@ class TestInstagramSquareProcessor:
             saved_image = Image.open(tmp.name)
             assert saved_image.size == (1080, 1080)
 
+    def test_save_optimized_to_buffer(self):
+        """Test saving optimized image into an in-memory buffer."""
+        image = Image.new('RGB', (1080, 1080), (128, 128, 128))
+        buffer = io.BytesIO()
+
+        metadata = self.processor.save_optimized(image, buffer)
+
+        assert metadata['file_path'] is None
+        assert metadata['file_size_bytes'] == len(buffer.getvalue())
+        assert Image.open(io.BytesIO(buffer.getvalue())).size == (1080, 1080)
+
+    def test_save_optimized_uses_420_subsampling(self):
+        """Test Instagram output uses 4:2:0 chroma subsampling even at Q95."""
+        from PIL import JpegImagePlugin
+        image = Image.new('RGB', (1080, 1080), (200, 60, 90))
+        buffer = io.BytesIO()
+
+        metadata = self.processor.save_optimized(image, buffer)
+
+        assert metadata['quality'] == InstagramSquareProcessor.QUALITY_START
+        assert JpegImagePlugin.get_sampling(Image.open(buffer)) == 2
+
     def test_process_various_formats(self):
         """Test processing different input formats."""
         formats_to_test = [
@@ -151,3 +185,19 @@ class TestInstagramSquareProcessor:
         tall_image = Image.new('RGB', (1000, 4000), (0, 255, 0))
         result = self.processor.process(tall_image)
         assert result.size == (1080, 1080)
+
+    def test_get_decode_size(self):
+        """Test draft decode size keeps the short side at or above the target."""
+        assert self.processor.get_decode_size((1200, 1200)) is None
+
+        width, height = self.processor.get_decode_size((6000, 4000))
+        assert min(width, height) >= 1080
+
+        # Draft-decoded JPEG still processes to the full target size
+        buffer = io.BytesIO()
+        Image.new('RGB', (6000, 4000), (10, 20, 30)).save(buffer, format='JPEG')
+        buffer.seek(0)
+        image = Image.open(buffer)
+        image.draft(image.mode, self.processor.get_decode_size(image.size))
+        assert image.size == (3000, 2000)
+        assert self.processor.process(image).size == (1080, 1080)
@@ -1,10 +1,11 @@
 import io
 import logging
-from typing import Any
+from typing import Any, BinaryIO
 
 from PIL import Image, ImageFile
 
 from .base import BaseProcessor
+from .optimization_utils import OptimizationUtils
 
 # Set up logging for detailed file size tracking
 logger = logging.getLogger(__name__)
@@ -22,6 +23,7 @@ class InstagramSquareProcessor(BaseProcessor):
     FORMAT = 'JPEG'
     QUALITY_START = 95
     QUALITY_MIN = 60
+    SUBSAMPLING = 2  # 4:2:0 chroma at every quality, including Q95
 
     def process(self, image: Image.Image) -> Image.Image:
         """
@@ -33,41 +35,68 @@ class InstagramSquareProcessor(BaseProcessor):
         Returns:
             Processed PIL Image optimized for Instagram
         """
+        # Size logging measures the image at each step, so skip it when INFO is off
+        log_sizes = logger.isEnabledFor(logging.INFO)
         logger.info("=== INSTAGRAM SQUARE PROCESSING START ===")
 
         # Log initial image details
-        initial_size = self.get_image_memory_size(image)
-        logger.info(f"Initial PIL image: size={image.size}, mode={image.mode}, format={image.format}")
-        logger.info(f"Initial PIL memory size: {initial_size} bytes ({initial_size/1024:.1f} KB)")
-
-        # Fix orientation and ensure RGB mode for JPEG output
-        image = self._fix_orientation_and_ensure_rgb(image)
-        rgb_size = self.get_image_memory_size(image)
-        logger.info(f"After RGB conversion: mode={image.mode}, memory_size={rgb_size} bytes ({rgb_size/1024:.1f} KB)")
-
-        # Smart crop to square aspect ratio if needed
-        current_width, current_height = image.size
-        if current_width != current_height:
-            logger.info(f"Cropping from {current_width}x{current_height} to square aspect ratio")
-            image = self._smart_crop(image, self.TARGET_WIDTH, self.TARGET_HEIGHT)
-            crop_size = self.get_image_memory_size(image)
-            logger.info(f"After crop: size={image.size}, memory_size={crop_size} bytes ({crop_size/1024:.1f} KB)")
-
-        # Resize to target dimensions
+        if log_sizes:
+            initial_size = self.get_image_memory_size(image)
+            logger.info(
+                f"Initial PIL image: size={image.size}, mode={image.mode}, "
+                f"format={image.format}"
+            )
+            logger.info(
+                f"Initial PIL memory size: {initial_size} bytes "
+                f"({initial_size/1024:.1f} KB)"
+            )
+
+        # Fix orientation and ensure RGB mode for JPEG output. Grayscale converts
+        # to exactly the same RGB after resampling, so it is converted at output
+        # size below instead of materializing a full-size RGB copy here
+        image = OptimizationUtils.fix_image_orientation(image)
+        if image.mode != 'L':
+            image = self._ensure_rgb(image)
+        if log_sizes:
+            rgb_size = self.get_image_memory_size(image)
+            logger.info(
+                f"After RGB conversion: mode={image.mode}, "
+                f"memory_size={rgb_size} bytes ({rgb_size/1024:.1f} KB)"
+            )
+
+        # Crop to square and resize to target dimensions in a single pass
         if image.size != (self.TARGET_WIDTH, self.TARGET_HEIGHT):
-            logger.info(f"Resizing from {image.size} to {self.TARGET_WIDTH}x{self.TARGET_HEIGHT}")
-            image = self._resize_with_quality(image, self.TARGET_WIDTH, self.TARGET_HEIGHT)
-            resize_size = self.get_image_memory_size(image)
-            logger.info(f"After resize: size={image.size}, memory_size={resize_size} bytes ({resize_size/1024:.1f} KB)")
+            if log_sizes:
+                logger.info(
+                    f"Cropping/resizing from {image.size} to "
+                    f"{self.TARGET_WIDTH}x{self.TARGET_HEIGHT}"
+                )
+            image = self._crop_and_resize(image, self.TARGET_WIDTH, self.TARGET_HEIGHT)
+            if log_sizes:
+                resize_size = self.get_image_memory_size(image)
+                logger.info(
+                    f"After crop/resize: size={image.size}, "
+                    f"memory_size={resize_size} bytes ({resize_size/1024:.1f} KB)"
+                )
+
+        image = self._ensure_rgb(image)
 
         # Processing complete - optimization will happen during save
-        final_size = self.get_image_memory_size(image)
-        logger.info(f"Final processed PIL image: memory_size={final_size} bytes ({final_size/1024:.1f} KB)")
+        if log_sizes:
+            final_size = self.get_image_memory_size(image)
+            logger.info(
+                f"Final processed PIL image: memory_size={final_size} bytes "
+                f"({final_size/1024:.1f} KB)"
+            )
         logger.info("File size optimization will be performed during save...")
 
         logger.info("=== INSTAGRAM SQUARE PROCESSING END ===")
         return image
 
+    def get_decode_size(self, image_size: tuple[int, int]) -> tuple[int, int] | None:
+        """Decode just large enough for the square crop to cover the target size."""
+        return self._scaled_decode_size(image_size, self.TARGET_WIDTH / min(image_size))
+
     def get_preset_config(self) -> dict[str, Any]:
         """Get Instagram square preset configuration."""
         return {
@@ -82,13 +111,15 @@ class InstagramSquareProcessor(BaseProcessor):
         }
 
 
-    def save_optimized(self, image: Image.Image, output_path: str) -> dict[str, Any]:
+    def save_optimized(
+        self, image: Image.Image, output_path: str | BinaryIO
+    ) -> dict[str, Any]:
         """
         Save optimized image and return metadata.
 
         Args:
             image: Processed PIL Image
-            output_path: Path to save the image
+            output_path: Path or binary buffer to save the image to
 
         Returns:
             Dictionary with save metadata
@@ -104,7 +135,8 @@ class InstagramSquareProcessor(BaseProcessor):
             format_type=self.FORMAT,
             quality_start=self.QUALITY_START,
             quality_min=self.QUALITY_MIN,
-            progressive=True
+            progressive=True,
+            extra_save_kwargs={'subsampling': self.SUBSAMPLING}
         )
 
         logger.info("=== SAVE_OPTIMIZED END ===")
@@ -112,4 +144,8 @@ class InstagramSquareProcessor(BaseProcessor):
 
     def get_compression_params(self, quality: int = 95) -> dict[str, Any]:
         """Get Instagram-specific compression parameters."""
-        return super().get_compression_params(quality=quality, format_type=self.FORMAT)
+        params = super().get_compression_params(
+            quality=quality, format_type=self.FORMAT
+        )
+        params['subsampling'] = self.SUBSAMPLING
+        return params
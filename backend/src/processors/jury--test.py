@@ -90,7 +90,7 @@ class TestJurySubmissionProcessor:
             metadata = self.processor.save_optimized(image, tmp.name)
 
             assert metadata['format'] == 'JPEG'
-            assert metadata['dimensions'] == '1920×1280'
+            assert metadata['dimensions'] == '1920x1280'
             # More flexible file size check - should be reasonable for jury submissions
             assert 0.1 <= metadata['file_size_mb'] <= 3.0  # Allow wider range
             assert 'dpi' in metadata
@@ -1,9 +1,10 @@
 import io
-from typing import Any
+from typing import Any, BinaryIO
 
 from PIL import Image, ImageFile
 
 from .base import BaseProcessor
+from .optimization_utils import PROBE_OPTIMIZE, OptimizationUtils
 
 # Allow loading of truncated images
 ImageFile.LOAD_TRUNCATED_IMAGES = True
@@ -19,6 +20,7 @@ class JurySubmissionProcessor(BaseProcessor):
     QUALITY_START = 95
     QUALITY_MIN = 60
     DPI_RANGE = (72, 300)
+    DPI = 150  # Mid-range DPI suitable for most jury submissions
 
     def process(self, image: Image.Image) -> Image.Image:
         """
@@ -28,18 +30,25 @@ class JurySubmissionProcessor(BaseProcessor):
             image: Input PIL Image
             
         Returns:
-            Processed PIL Image optimized for jury submissions
+            Processed PIL Image carrying its jury-optimized encoding in info
         """
         # Fix orientation and ensure RGB mode for JPEG output
+        source = image
         image = self._fix_orientation_and_ensure_rgb(image)
 
         # Resize to fit within max dimension while preserving aspect ratio
         resized_image = self._resize_to_max_dimension(image, self.TARGET_MAX_DIMENSION)
 
         # Optimize file size to meet jury requirements (1-2MB)
-        optimized_image = self._optimize_for_jury_size(resized_image)
+        quality, data = self._optimize_for_jury_size(resized_image)
 
-        return optimized_image
+        return OptimizationUtils.attach_encoding(resized_image, source, quality, data)
+
+    def get_decode_size(self, image_size: tuple[int, int]) -> tuple[int, int] | None:
+        """Decode just large enough for the longest side to reach the target."""
+        return self._scaled_decode_size(
+            image_size, self.TARGET_MAX_DIMENSION / max(image_size)
+        )
 
     def get_preset_config(self) -> dict[str, Any]:
         """Get jury submission preset configuration."""
@@ -73,7 +82,7 @@ class JurySubmissionProcessor(BaseProcessor):
 
         return self._resize_with_quality(image, new_width, new_height)
 
-    def _optimize_for_jury_size(self, image: Image.Image) -> Image.Image:
+    def _optimize_for_jury_size(self, image: Image.Image) -> tuple[int, bytes]:
         """
         Optimize image file size to meet jury submission requirements (1-2MB).
         
@@ -81,117 +90,78 @@ class JurySubmissionProcessor(BaseProcessor):
             image: PIL Image to optimize
             
         Returns:
-            Optimized PIL Image
+            Tuple of (chosen quality, encoded JPEG bytes)
         """
-        min_size_bytes = self.MIN_FILE_SIZE_MB * 1024 * 1024
         max_size_bytes = self.MAX_FILE_SIZE_MB * 1024 * 1024
         quality = self.QUALITY_START
+        final_quality = None
 
-        # First, try to find a quality that gives us a file size in the target range
+        # Find the highest quality (in 5-point steps) under the maximum size; a
+        # file under the 1MB minimum can't be raised above QUALITY_START anyway
         while quality >= self.QUALITY_MIN:
             # Save to bytes to check file size
-            output_buffer = io.BytesIO()
-
-            # Save with current quality and reasonable DPI
-            save_kwargs = {
-                'format': self.FORMAT,
-                'quality': quality,
-                'optimize': True,
-                'dpi': (150, 150)  # Mid-range DPI suitable for most jury submissions
-            }
-
-            image.save(output_buffer, **save_kwargs)
-            file_size = output_buffer.tell()
-
-            # If file size is in acceptable range, return the image
-            if min_size_bytes <= file_size <= max_size_bytes:
-                output_buffer.seek(0)
-                return Image.open(output_buffer)
-
-            # If file is too small, increase quality or break
-            if file_size < min_size_bytes and quality == self.QUALITY_START:
-                # File is naturally small, return with high quality
-                output_buffer.seek(0)
-                return Image.open(output_buffer)
+            test_buffer = io.BytesIO()
+            image.save(
+                test_buffer,
+                format=self.FORMAT,
+                quality=quality,
+                optimize=PROBE_OPTIMIZE,
+                dpi=(self.DPI, self.DPI)
+            )
+            file_size = test_buffer.tell()
 
             # If file is too large, reduce quality
             if file_size > max_size_bytes:
                 quality -= 5
-            else:
-                break
+                continue
+
+            final_quality = quality
+            break
+
+        # If we can't get into the ideal range, use the best quality we can
+        if final_quality is None:
+            final_quality = self.QUALITY_MIN
 
-        # If we can't get into the ideal range, return with the best quality we can
+        # Encode once with optimal settings
         output_buffer = io.BytesIO()
-        final_quality = max(quality, self.QUALITY_MIN)
-        image.save(
-            output_buffer,
-            format=self.FORMAT,
-            quality=final_quality,
-            optimize=True,
-            dpi=(150, 150)
-        )
-        output_buffer.seek(0)
-        return Image.open(output_buffer)
+        image.save(output_buffer, **self.get_compression_params(final_quality))
+        return final_quality, output_buffer.getvalue()
 
-    def save_optimized(self, image: Image.Image, output_path: str) -> dict[str, Any]:
+    def save_optimized(
+        self, image: Image.Image, output_path: str | BinaryIO
+    ) -> dict[str, Any]:
         """
         Save optimized image for jury submission and return metadata.
         
         Args:
             image: Processed PIL Image
-            output_path: Path to save the image
+            output_path: Path or binary buffer to save the image to
             
         Returns:
             Dictionary with save metadata
         """
-        # Find optimal quality for target file size range
         min_size_bytes = self.MIN_FILE_SIZE_MB * 1024 * 1024
         max_size_bytes = self.MAX_FILE_SIZE_MB * 1024 * 1024
-        quality = self.QUALITY_START
-        final_quality = quality
-        final_dpi = 150
 
-        while quality >= self.QUALITY_MIN:
-            test_buffer = io.BytesIO()
-            image.save(
-                test_buffer,
-                format=self.FORMAT,
-                quality=quality,
-                optimize=True,
-                dpi=(final_dpi, final_dpi)
-            )
-            file_size = test_buffer.tell()
-
-            if min_size_bytes <= file_size <= max_size_bytes:
-                final_quality = quality
-                break
-            elif file_size > max_size_bytes:
-                quality -= 5
-            else:
-                final_quality = quality
-                break
-
-        # Save with optimal settings
-        save_kwargs = {
-            'format': self.FORMAT,
-            'quality': final_quality,
-            'optimize': True,
-            'dpi': (final_dpi, final_dpi)
-        }
+        encoding = OptimizationUtils.pop_encoding(image)
+        if encoding is not None:
+            final_quality = encoding['quality']
+            data = encoding['data']
+        else:
+            # Find optimal quality for target file size range
+            final_quality, data = self._optimize_for_jury_size(image)
 
-        image.save(output_path, **save_kwargs)
+        file_size = OptimizationUtils.write_encoded(output_path, data)
 
         # Return metadata
-        import os
-        file_size = os.path.getsize(output_path)
         return {
-            'file_path': output_path,
+            'file_path': OptimizationUtils.get_output_file_path(output_path),
             'file_size_bytes': file_size,
             'file_size_mb': round(file_size / (1024 * 1024), 2),
             'quality': final_quality,
-            'dimensions': f'{image.size[0]}×{image.size[1]}',
+            'dimensions': f'{image.size[0]}x{image.size[1]}',
             'format': self.FORMAT,
-            'dpi': final_dpi,
+            'dpi': self.DPI,
             'meets_jury_requirements': min_size_bytes <= file_size <= max_size_bytes
         }
 
@@ -201,5 +171,5 @@ class JurySubmissionProcessor(BaseProcessor):
             'format': self.FORMAT,
             'quality': quality,
             'optimize': True,
-            'dpi': (150, 150)  # Mid-range DPI for jury submissions
+            'dpi': (self.DPI, self.DPI)  # Mid-range DPI for jury submissions
         }
@@ -0,0 +1,59 @@
+import io
+
+import pytest
+from PIL import Image
+
+from .compress import QuickCompressProcessor
+from .custom import CustomProcessor
+from .email import EmailNewsletterProcessor
+from .jury import JurySubmissionProcessor
+from .optimization_utils import ENCODING_INFO_KEY, OptimizationUtils
+
+
+class TestEncodingHandOff:
+    """Test the process() to save_optimized() encoding hand-off."""
+
+    def test_attach_and_pop_encoding(self):
+        """Test an attached encoding is taken off the image exactly once."""
+        source = Image.new('RGB', (40, 30), (255, 128, 64))
+        processed = source.resize((20, 15))
+
+        result = OptimizationUtils.attach_encoding(
+            processed, source, 80, b'data', extra=1
+        )
+
+        assert result is processed
+        encoding = OptimizationUtils.pop_encoding(result)
+        assert encoding == {'quality': 80, 'data': b'data', 'extra': 1}
+        assert OptimizationUtils.pop_encoding(result) is None
+
+    def test_attach_encoding_copies_source(self):
+        """Test the caller's image is copied rather than changed."""
+        source = Image.new('RGB', (40, 30), (255, 128, 64))
+
+        result = OptimizationUtils.attach_encoding(source, source, 80, b'data')
+
+        assert result is not source
+        assert ENCODING_INFO_KEY not in source.info
+        assert OptimizationUtils.pop_encoding(result)['data'] == b'data'
+
+    @pytest.mark.parametrize('processor', [
+        QuickCompressProcessor(),
+        CustomProcessor(600, 400, 1.0, 'JPEG'),
+        EmailNewsletterProcessor(),
+        JurySubmissionProcessor(),
+    ], ids=lambda processor: type(processor).__name__)
+    def test_save_optimized_writes_process_encoding(self, processor):
+        """Test save_optimized writes the bytes process() already encoded."""
+        image = Image.new('RGB', (800, 600), (100, 150, 200))
+
+        result = processor.process(image)
+        encoding = result.info[ENCODING_INFO_KEY]
+
+        buffer = io.BytesIO()
+        metadata = processor.save_optimized(result, buffer)
+
+        assert ENCODING_INFO_KEY not in image.info
+        assert buffer.getvalue() == encoding['data']
+        assert metadata['quality'] == encoding['quality']
+        assert metadata['file_size_bytes'] == len(encoding['data'])
@@ -8,14 +8,40 @@ multiple processor implementations.
 
 import io
 import logging
+import math
 import os
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, BinaryIO, Dict, Optional
 
 from PIL import Image, ExifTags
 
 # EXIF orientation tag constant
 ORIENTATION = 274
 
+# Bytes per pixel by image mode, for get_image_memory_size()
+MODE_BYTES = MappingProxyType({
+    'L': 1,     # Grayscale
+    'P': 1,     # Palette
+    'RGB': 3,   # RGB
+    'RGBA': 4,  # RGBA
+    'CMYK': 4,  # CMYK
+    'YCbCr': 3, # YCbCr
+    'LAB': 3,   # LAB
+    'HSV': 3,   # HSV
+})
+
+# Image.info key carrying the encode chosen in process() through to save_optimized()
+ENCODING_INFO_KEY = 'pixelprep_encoding'
+
+# Images at least this large get a thumbnail encode to seed the quality search;
+# smaller ones are cheap enough to bisect directly
+SEED_PROBE_MIN_PIXELS = 250_000
+
+# Size probes skip Huffman optimization: it roughly doubles baseline JPEG encode
+# time for ~3% smaller output, so an unoptimized probe never undershoots the
+# final optimized save. Progressive JPEG always optimizes, so it is unaffected.
+PROBE_OPTIMIZE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -131,22 +157,207 @@ class OptimizationUtils:
             Approximate memory size in bytes
         """
         width, height = image.size
-        mode = image.mode
-
-        # Calculate bytes per pixel based on mode
-        mode_bytes = {
-            'L': 1,     # Grayscale
-            'P': 1,     # Palette
-            'RGB': 3,   # RGB
-            'RGBA': 4,  # RGBA
-            'CMYK': 4,  # CMYK
-            'YCbCr': 3, # YCbCr
-            'LAB': 3,   # LAB
-            'HSV': 3,   # HSV
-        }
+        return width * height * MODE_BYTES.get(image.mode, 3)  # Default to RGB
+
+    @staticmethod
+    def get_saved_file_size(output: str | BinaryIO) -> int:
+        """
+        Get the size of an image that was just saved to a path or buffer.
+
+        Args:
+            output: Filesystem path or binary buffer the image was saved to
+
+        Returns:
+            Saved file size in bytes
+        """
+        if isinstance(output, (str, os.PathLike)):
+            return os.path.getsize(output)
+        return output.seek(0, io.SEEK_END)
+
+    @staticmethod
+    def write_encoded(output: str | BinaryIO, data: bytes) -> int:
+        """
+        Write already-encoded image bytes to a path or buffer.
+
+        Args:
+            output: Filesystem path or binary buffer to write to
+            data: Encoded image bytes
+
+        Returns:
+            Written file size in bytes, so callers needn't stat the output
+        """
+        if isinstance(output, (str, os.PathLike)):
+            with open(output, 'wb') as f:
+                f.write(data)
+        else:
+            output.write(data)
+        return len(data)
+
+    @staticmethod
+    def attach_encoding(
+        image: Image.Image,
+        source: Image.Image,
+        quality: Optional[int],
+        data: bytes,
+        **extra: Any
+    ) -> Image.Image:
+        """
+        Record the encode chosen in process() for save_optimized() to write.
+
+        The pixels stay as they are, so save_optimized() writes these bytes
+        instead of decoding them back into an image and encoding again. An
+        image that is still the caller's source object is copied first, so
+        process() never changes its input.
+
+        Args:
+            image: Processed PIL Image
+            source: Image that was passed to process()
+            quality: Quality the data was encoded at, or None if lossless
+            data: Encoded image bytes
+            **extra: Additional processor-specific values to carry along
+
+        Returns:
+            Processed PIL Image carrying the encoding in info
+        """
+        if image is source:
+            image = image.copy()
+        image.info[ENCODING_INFO_KEY] = {'quality': quality, 'data': data, **extra}
+        return image
+
+    @staticmethod
+    def pop_encoding(image: Image.Image) -> Optional[Dict[str, Any]]:
+        """
+        Take the encoding recorded by attach_encoding() off a processed image.
+
+        Args:
+            image: Processed PIL Image
+
+        Returns:
+            Dictionary with 'quality', 'data' and any extra values, or None if
+            the image did not come through process()
+        """
+        return image.info.pop(ENCODING_INFO_KEY, None)
+
+    @staticmethod
+    def get_output_file_path(output: str | BinaryIO) -> Optional[str]:
+        """Return the filesystem path for metadata, or None for in-memory buffers."""
+        if isinstance(output, (str, os.PathLike)):
+            return os.fspath(output)
+        return None
+
+    @staticmethod
+    def search_quality(
+        image: Image.Image,
+        max_size_bytes: int,
+        save_kwargs: Dict[str, Any],
+        quality_start: int = 95,
+        quality_min: int = 40,
+        quality_step: int = 5,
+    ) -> tuple[Optional[int], Optional[io.BytesIO]]:
+        """
+        Bisect for the highest quality whose encode fits max_size_bytes.
+
+        File size grows with quality, so bisecting the quality_step grid from
+        quality_start down to quality_min takes about log2 of the grid size in
+        encodes instead of one per step. Larger images seed the first probe
+        from predict_quality(); a wrong prediction only costs that one probe.
 
-        bytes_per_pixel = mode_bytes.get(mode, 3)  # Default to RGB
-        return width * height * bytes_per_pixel
+        Args:
+            image: PIL Image to encode
+            max_size_bytes: Maximum file size in bytes
+            save_kwargs: Image.save() kwargs other than quality
+            quality_start: Highest quality to try
+            quality_min: Lowest quality to try
+            quality_step: Spacing of the tried qualities
+
+        Returns:
+            Tuple of (quality, buffer holding its encode), or (None, None) if
+            even quality_min is too large
+        """
+        best_quality = best_buffer = None
+        # Grid index i is quality_start - i * quality_step; size falls as i grows
+        low, high = 0, (quality_start - quality_min) // quality_step
+
+        # The first probe goes to the predicted quality rather than the midpoint
+        mid = None
+        if image.size[0] * image.size[1] >= SEED_PROBE_MIN_PIXELS:
+            seed_quality = OptimizationUtils.predict_quality(
+                image,
+                max_size_bytes,
+                save_kwargs,
+                quality_start,
+                quality_min,
+                quality_step,
+            )
+            mid = (quality_start - seed_quality) // quality_step
+
+        # Probes reuse a scratch buffer; a fitting probe swaps it with the best one
+        output_buffer = io.BytesIO()
+
+        while low <= high:
+            if mid is None:
+                mid = (low + high) // 2
+            quality = quality_start - mid * quality_step
+            output_buffer.seek(0)
+            output_buffer.truncate()
+            image.save(output_buffer, quality=quality, **save_kwargs)
+            file_size = output_buffer.tell()
+
+            logger.info(
+                f"Probe Q={quality}: {file_size} bytes ({file_size/1024:.1f} KB)"
+            )
+
+            if file_size <= max_size_bytes:
+                best_quality = quality
+                best_buffer, output_buffer = output_buffer, best_buffer or io.BytesIO()
+                high = mid - 1
+            else:
+                low = mid + 1
+            mid = None
+
+        return best_quality, best_buffer
+
+    @staticmethod
+    def predict_quality(
+        image: Image.Image,
+        max_size_bytes: int,
+        save_kwargs: Dict[str, Any],
+        quality_start: int = 95,
+        quality_min: int = 40,
+        quality_step: int = 5,
+    ) -> int:
+        """
+        Predict the highest fitting quality from a quarter-scale thumbnail encode.
+
+        Encoded size is roughly linear in pixel count at a fixed quality, and
+        each quality step down saves a roughly constant fraction, so the
+        thumbnail's overshoot maps to a number of steps below quality_start.
+
+        Args:
+            image: PIL Image to encode
+            max_size_bytes: Maximum file size in bytes
+            save_kwargs: Image.save() kwargs other than quality
+            quality_start: Highest quality to try
+            quality_min: Lowest quality to try
+            quality_step: Spacing of the tried qualities
+
+        Returns:
+            Predicted quality on the quality_step grid
+        """
+        width, height = image.size
+        thumbnail = image.resize((width // 4, height // 4), Image.Resampling.BILINEAR)
+        thumbnail_buffer = io.BytesIO()
+        thumbnail.save(thumbnail_buffer, quality=quality_start, **save_kwargs)
+        ratio = thumbnail_buffer.tell() * 16 / max_size_bytes
+
+        logger.info(
+            f"Thumbnail probe predicts {ratio:.2f}x the size limit at Q={quality_start}"
+        )
+
+        if ratio <= 1.0:
+            return quality_start
+        steps = math.ceil(math.log2(ratio))
+        return max(quality_start - steps * quality_step, quality_min)
 
     @staticmethod
     def optimize_file_size(
@@ -160,7 +371,7 @@ class OptimizationUtils:
         extra_save_kwargs: Optional[Dict[str, Any]] = None
     ) -> Image.Image:
         """
-        Optimize image file size by iteratively reducing quality.
+        Optimize image file size by bisecting the quality.
 
         Args:
             image: PIL Image to optimize
@@ -175,43 +386,31 @@ class OptimizationUtils:
         Returns:
             Optimized PIL Image
         """
-        quality = quality_start
         extra_kwargs = extra_save_kwargs or {}
 
         logger.info(f"Optimizing file size: max={max_size_bytes} bytes, format={format_type}")
         logger.info(f"Quality range: {quality_start} to {quality_min}, step={quality_step}")
 
-        attempt = 1
-        while quality >= quality_min:
-            output_buffer = io.BytesIO()
-
-            # Prepare save kwargs
-            save_kwargs = {
-                'format': format_type,
-                'quality': quality,
-                'optimize': True,
-                **extra_kwargs
-            }
-
-            # Add progressive for JPEG only
-            if format_type.upper() == 'JPEG':
-                save_kwargs['progressive'] = progressive
-
-            image.save(output_buffer, **save_kwargs)
-            file_size = output_buffer.tell()
+        # Probes skip Huffman optimization (see PROBE_OPTIMIZE)
+        save_kwargs = {
+            'format': format_type,
+            'optimize': PROBE_OPTIMIZE,
+            **extra_kwargs
+        }
 
-            logger.info(f"Attempt {attempt}: Quality={quality}, size={file_size} bytes ({file_size/1024:.1f} KB)")
+        # Add progressive for JPEG only
+        if format_type.upper() == 'JPEG':
+            save_kwargs['progressive'] = progressive
 
-            # If file size is acceptable, return the image
-            if file_size <= max_size_bytes:
-                logger.info(f"✓ File size acceptable at Q={quality}")
-                output_buffer.seek(0)
-                return Image.open(output_buffer)
+        quality, output_buffer = OptimizationUtils.search_quality(
+            image, max_size_bytes, save_kwargs, quality_start, quality_min, quality_step
+        )
 
-            # Reduce quality and try again
-            logger.info(f"✗ File size {file_size} > {max_size_bytes}, reducing quality...")
-            quality -= quality_step
-            attempt += 1
+        # If file size is acceptable, return the image
+        if output_buffer is not None:
+            logger.info(f"✓ File size acceptable at Q={quality}")
+            output_buffer.seek(0)
+            return Image.open(output_buffer)
 
         # If we can't meet size requirements, return with minimum quality
         logger.warning(f"Could not meet size requirements, using minimum quality {quality_min}")
@@ -236,7 +435,7 @@ class OptimizationUtils:
     @staticmethod
     def save_optimized_with_metadata(
         image: Image.Image,
-        output_path: str,
+        output_path: str | BinaryIO,
         max_size_bytes: int,
         format_type: str = 'JPEG',
         quality_start: int = 95,
@@ -250,7 +449,7 @@ class OptimizationUtils:
 
         Args:
             image: Processed PIL Image
-            output_path: Path to save the image
+            output_path: Path or binary buffer to save the image to
             max_size_bytes: Maximum file size in bytes
             format_type: Output format
             quality_start: Starting quality value
@@ -265,33 +464,24 @@ class OptimizationUtils:
         logger.info(f"Saving optimized image to: {output_path}")
 
         # Find optimal quality for file size
-        quality = quality_start
-        final_quality = quality_min
         extra_kwargs = extra_save_kwargs or {}
 
-        while quality >= quality_min:
-            test_buffer = io.BytesIO()
-
-            save_kwargs = {
-                'format': format_type,
-                'quality': quality,
-                'optimize': True,
-                **extra_kwargs
-            }
-
-            if format_type.upper() == 'JPEG':
-                save_kwargs['progressive'] = progressive
-
-            image.save(test_buffer, **save_kwargs)
-            test_size = test_buffer.tell()
+        save_kwargs = {
+            'format': format_type,
+            'optimize': PROBE_OPTIMIZE,
+            **extra_kwargs
+        }
 
-            logger.info(f"Test save Q={quality}: {test_size} bytes ({test_size/1024:.1f} KB)")
+        if format_type.upper() == 'JPEG':
+            save_kwargs['progressive'] = progressive
 
-            if test_size <= max_size_bytes:
-                final_quality = quality
-                logger.info(f"✓ Found optimal quality: Q={final_quality}")
-                break
-            quality -= quality_step
+        final_quality, best_buffer = OptimizationUtils.search_quality(
+            image, max_size_bytes, save_kwargs, quality_start, quality_min, quality_step
+        )
+        if final_quality is None:
+            final_quality = quality_min
+        else:
+            logger.info(f"✓ Found optimal quality: Q={final_quality}")
 
         # Save with optimal quality
         save_kwargs = {
@@ -305,18 +495,22 @@ class OptimizationUtils:
             save_kwargs['progressive'] = progressive
 
         logger.info(f"Saving with final settings: Q={final_quality}, format={format_type}")
-        image.save(output_path, **save_kwargs)
+        if best_buffer is not None and format_type.upper() == 'JPEG' and progressive:
+            # Progressive JPEG always optimizes, so the fitting probe is final
+            OptimizationUtils.write_encoded(output_path, best_buffer.getvalue())
+        else:
+            image.save(output_path, **save_kwargs)
 
         # Return metadata
-        file_size = os.path.getsize(output_path)
+        file_size = OptimizationUtils.get_saved_file_size(output_path)
         logger.info(f"Final saved file size: {file_size} bytes ({file_size/1024:.1f} KB)")
 
         metadata = {
-            'file_path': output_path,
+            'file_path': OptimizationUtils.get_output_file_path(output_path),
             'file_size_bytes': file_size,
             'file_size_mb': round(file_size / (1024 * 1024), 2),
             'quality': final_quality,
-            'dimensions': f'{image.size[0]}×{image.size[1]}',
+            'dimensions': f'{image.size[0]}x{image.size[1]}',
             'format': format_type
         }
 
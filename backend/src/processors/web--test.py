@@ -55,7 +55,7 @@ class TestWebDisplayProcessor:
             metadata = self.processor.save_optimized(image, tmp.name)
 
             assert metadata['format'] in ['JPEG', 'WebP']
-            assert metadata['dimensions'] == '1920×1080'
+            assert metadata['dimensions'] == '1920x1080'
             assert metadata['file_size_kb'] <= 500
 
             # Verify file exists
@@ -1,9 +1,10 @@
 import io
-from typing import Any
+from typing import Any, BinaryIO
 
 from PIL import Image, ImageFile
 
 from .base import BaseProcessor
+from .optimization_utils import OptimizationUtils
 
 # Allow loading of truncated images
 ImageFile.LOAD_TRUNCATED_IMAGES = True
@@ -44,6 +45,10 @@ class WebDisplayProcessor(BaseProcessor):
             optimized_image = self._optimize_for_web(resized_image, self.FALLBACK_FORMAT)
             return optimized_image
 
+    def get_decode_size(self, image_size: tuple[int, int]) -> tuple[int, int] | None:
+        """Decode large enough for the target width on either side (EXIF may rotate)."""
+        return self._scaled_decode_size(image_size, self.TARGET_WIDTH / min(image_size))
+
     def get_preset_config(self) -> dict[str, Any]:
         """Get web display preset configuration."""
         return {
@@ -135,20 +140,23 @@ class WebDisplayProcessor(BaseProcessor):
         output_buffer.seek(0)
         return Image.open(output_buffer)
 
-    def save_optimized(self, image: Image.Image, output_path: str) -> dict[str, Any]:
+    def save_optimized(
+        self, image: Image.Image, output_path: str | BinaryIO
+    ) -> dict[str, Any]:
         """
         Save optimized image for web display and return metadata.
         
         Args:
             image: Processed PIL Image
-            output_path: Path to save the image
+            output_path: Path or binary buffer to save the image to
             
         Returns:
             Dictionary with save metadata
         """
-        # Determine format from output path
+        # Determine format from output path; in-memory buffers get the primary format
         format_type = self.PRIMARY_FORMAT
-        if output_path.lower().endswith('.jpg') or output_path.lower().endswith('.jpeg'):
+        file_path = OptimizationUtils.get_output_file_path(output_path)
+        if file_path and file_path.lower().endswith(('.jpg', '.jpeg')):
             format_type = self.FALLBACK_FORMAT
 
         # Find optimal quality for target file size
@@ -216,7 +224,12 @@ class WebDisplayProcessor(BaseProcessor):
         except (OSError, NotImplementedError):
             # Final fallback to JPEG
             format_type = self.FALLBACK_FORMAT
-            output_path = output_path.rsplit('.', 1)[0] + '.jpg'
+            if file_path:
+                output_path = file_path.rsplit('.', 1)[0] + '.jpg'
+            else:
+                # Discard any partial write before re-encoding into the buffer
+                output_path.seek(0)
+                output_path.truncate()
             save_kwargs = {
                 'format': format_type,
                 'quality': final_quality,
@@ -226,14 +239,13 @@ class WebDisplayProcessor(BaseProcessor):
             image.save(output_path, **save_kwargs)
 
         # Return metadata
-        import os
-        file_size = os.path.getsize(output_path)
+        file_size = OptimizationUtils.get_saved_file_size(output_path)
         return {
-            'file_path': output_path,
+            'file_path': OptimizationUtils.get_output_file_path(output_path),
             'file_size_bytes': file_size,
             'file_size_kb': round(file_size / 1024, 1),
             'quality': final_quality,
-            'dimensions': f'{image.size[0]}×{image.size[1]}',
+            'dimensions': f'{image.size[0]}x{image.size[1]}',
             'format': format_type,
             'meets_size_requirement': file_size <= (self.MAX_FILE_SIZE_KB * 1024),
             'compression_ratio': f'{image.size[0] / self.TARGET_WIDTH:.1f}x' if image.size[0] != self.TARGET_WIDTH else '1.0x'
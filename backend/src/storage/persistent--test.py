@@ -98,6 +98,45 @@ class TestPersistentStorage:
         assert result["success"] is False
         assert "Upload failed" in result["error"]
 
+    @patch('backend.src.storage.persistent.get_supabase_client')
+    @patch('backend.src.storage.persistent.get_storage_helper')
+    @patch('uuid.uuid4')
+    def test_store_original_image_bytes_success(self, mock_uuid, mock_get_storage,
+                                              mock_get_supabase):
+        """Test storing original image bytes without a local file."""
+        mock_uuid.return_value = MagicMock()
+        mock_uuid.return_value.__str__ = lambda x: "test-uuid"
+
+        mock_storage_helper = MagicMock()
+        mock_storage_helper.upload_original_image_bytes.return_value = {
+            "success": True,
+            "storage_path": "user123/test-uuid.jpg",
+            "public_url": "https://test.com/image.jpg"
+        }
+
+        mock_client = MagicMock()
+        mock_table = MagicMock()
+        mock_client.table.return_value = mock_table
+        mock_table.insert.return_value.execute.return_value.data = [{"id": "img123"}]
+
+        mock_get_supabase.return_value = mock_client
+        mock_get_storage.return_value = mock_storage_helper
+
+        storage = PersistentStorage("user123")
+        result = storage.store_original_image_bytes(
+            b"fake image data", "test.jpg", {"dimensions": "800x600"}
+        )
+
+        assert result["success"] is True
+        assert result["image_id"] == "img123"
+
+        mock_storage_helper.upload_original_image_bytes.assert_called_once_with(
+            b"fake image data", "user123", "test-uuid.jpg"
+        )
+        # Size is taken from the bytes themselves
+        inserted = mock_table.insert.call_args[0][0]
+        assert inserted["original_size"] == len(b"fake image data")
+
     @patch('backend.src.storage.persistent.get_supabase_client')
     @patch('backend.src.storage.persistent.get_storage_helper')
     @patch('os.path.getsize')
@@ -59,41 +59,87 @@ class PersistentStorage:
                     "error": f"Storage upload failed: {upload_result['error']}"
                 }
 
-            # Save record to database (matching actual table schema)
-            file_size = os.path.getsize(image_path)
-            image_record = {
-                "user_id": self.user_id,
-                "original_filename": filename,
-                "storage_path": upload_result["storage_path"],
-                "original_size": file_size,
-                "original_dimensions": metadata.get("dimensions", "Unknown"),
-                "metadata": metadata
+            return self._record_original_image(
+                upload_result, filename, os.path.getsize(image_path), metadata
+            )
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
             }
 
-            db_result = self.supabase.table("images").insert(image_record).execute()
+    def store_original_image_bytes(self, data: bytes, filename: str,
+                                 metadata: dict[str, Any]) -> dict[str, Any]:
+        """
+        Store in-memory original image data in persistent storage.
+
+        Args:
+            data: Original image bytes as uploaded
+            filename: Original filename
+            metadata: Image metadata
+
+        Returns:
+            Dictionary with storage information
+        """
+        try:
+            # Generate unique storage filename
+            file_extension = Path(filename).suffix
+            storage_filename = f"{uuid.uuid4()}{file_extension}"
+
+            # Upload to Supabase Storage
+            upload_result = self.storage_helper.upload_original_image_bytes(
+                data, self.user_id, storage_filename
+            )
 
-            if not db_result.data:
+            if not upload_result["success"]:
                 return {
                     "success": False,
-                    "error": "Failed to save image record to database"
+                    "error": f"Storage upload failed: {upload_result['error']}"
                 }
 
-            image_id = db_result.data[0]["id"]
+            return self._record_original_image(
+                upload_result, filename, len(data), metadata
+            )
 
+        except Exception as e:
             return {
-                "success": True,
-                "image_id": image_id,
-                "storage_path": upload_result["storage_path"],
-                "public_url": upload_result["public_url"],
-                "persistent": True
+                "success": False,
+                "error": str(e)
             }
 
-        except Exception as e:
+    def _record_original_image(self, upload_result: dict[str, Any], filename: str,
+                               file_size: int,
+                               metadata: dict[str, Any]) -> dict[str, Any]:
+        """Save the database record for a successfully uploaded original image."""
+        # Save record to database (matching actual table schema)
+        image_record = {
+            "user_id": self.user_id,
+            "original_filename": filename,
+            "storage_path": upload_result["storage_path"],
+            "original_size": file_size,
+            "original_dimensions": metadata.get("dimensions", "Unknown"),
+            "metadata": metadata
+        }
+
+        db_result = self.supabase.table("images").insert(image_record).execute()
+
+        if not db_result.data:
             return {
                 "success": False,
-                "error": str(e)
+                "error": "Failed to save image record to database"
             }
 
+        image_id = db_result.data[0]["id"]
+
+        return {
+            "success": True,
+            "image_id": image_id,
+            "storage_path": upload_result["storage_path"],
+            "public_url": upload_result["public_url"],
+            "persistent": True
+        }
+
     def store_optimized_image(self, image_path: str, image_id: str, preset: str,
                             optimization_metadata: dict[str, Any]) -> dict[str, Any]:
         """
@@ -109,20 +155,15 @@ class PersistentStorage:
             Dictionary with storage information
         """
         try:
-            # Get original image info
-            original_image = self.supabase.table("images").select("*").eq("id", image_id).single().execute()
-
-            if not original_image.data:
+            storage_filename = self._optimized_storage_filename(
+                image_id, preset, Path(image_path).suffix
+            )
+            if storage_filename is None:
                 return {
                     "success": False,
                     "error": "Original image not found"
                 }
 
-            original_filename = original_image.data["original_filename"]
-            base_filename = Path(original_filename).stem
-            file_extension = Path(image_path).suffix
-            storage_filename = f"{base_filename}_{preset}{file_extension}"
-
             # Upload to Supabase Storage
             upload_result = self.storage_helper.upload_optimized_image(
                 image_path, self.user_id, storage_filename, preset
@@ -134,42 +175,119 @@ class PersistentStorage:
                     "error": f"Storage upload failed: {upload_result['error']}"
                 }
 
-            # Save optimization record to database (matching processed_images schema)
-            optimization_record = {
-                "image_id": image_id,
-                "user_id": self.user_id,
-                "preset_name": preset,
-                "storage_path": upload_result["storage_path"],
-                "public_url": upload_result["public_url"],
-                "file_size_bytes": os.path.getsize(image_path),
-                "processed_at": datetime.utcnow().isoformat(),
-                "metadata": optimization_metadata
+            return self._record_optimized_image(
+                upload_result, image_id, preset, os.path.getsize(image_path),
+                optimization_metadata
+            )
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
             }
 
-            db_result = self.supabase.table("processed_images").insert(optimization_record).execute()
+    def store_optimized_image_bytes(self, data: bytes, image_id: str, preset: str,
+                                  optimization_metadata: dict[str, Any],
+                                  file_extension: str = ".jpg") -> dict[str, Any]:
+        """
+        Store in-memory optimized image data in persistent storage.
+
+        Args:
+            data: Encoded optimized image bytes
+            image_id: ID of the original image record
+            preset: Optimization preset used
+            optimization_metadata: Optimization results metadata
+            file_extension: Extension matching the encoded format (e.g. '.jpg')
+
+        Returns:
+            Dictionary with storage information
+        """
+        try:
+            storage_filename = self._optimized_storage_filename(
+                image_id, preset, file_extension
+            )
+            if storage_filename is None:
+                return {
+                    "success": False,
+                    "error": "Original image not found"
+                }
+
+            # Upload to Supabase Storage
+            upload_result = self.storage_helper.upload_optimized_image_bytes(
+                data, self.user_id, storage_filename, preset
+            )
 
-            if not db_result.data:
+            if not upload_result["success"]:
                 return {
                     "success": False,
-                    "error": "Failed to save optimization record to database"
+                    "error": f"Storage upload failed: {upload_result['error']}"
                 }
 
-            optimization_id = db_result.data[0]["id"]
+            return self._record_optimized_image(
+                upload_result, image_id, preset, len(data), optimization_metadata
+            )
 
+        except Exception as e:
             return {
-                "success": True,
-                "optimization_id": optimization_id,
-                "storage_path": upload_result["storage_path"],
-                "public_url": upload_result["public_url"],
-                "persistent": True
+                "success": False,
+                "error": str(e)
             }
 
-        except Exception as e:
+    def _optimized_storage_filename(self, image_id: str, preset: str,
+                                  file_extension: str) -> str | None:
+        """Build the optimized image's filename; None if the original is missing."""
+        # Get original image info
+        original_image = (
+            self.supabase.table("images")
+            .select("*")
+            .eq("id", image_id)
+            .single()
+            .execute()
+        )
+
+        if not original_image.data:
+            return None
+
+        original_filename = original_image.data["original_filename"]
+        base_filename = Path(original_filename).stem
+        return f"{base_filename}_{preset}{file_extension}"
+
+    def _record_optimized_image(self, upload_result: dict[str, Any], image_id: str,
+                              preset: str, file_size: int,
+                              optimization_metadata: dict[str, Any]) -> dict[str, Any]:
+        """Save the database record for a successfully uploaded optimized image."""
+        # Save optimization record to database (matching processed_images schema)
+        optimization_record = {
+            "image_id": image_id,
+            "user_id": self.user_id,
+            "preset_name": preset,
+            "storage_path": upload_result["storage_path"],
+            "public_url": upload_result["public_url"],
+            "file_size_bytes": file_size,
+            "processed_at": datetime.utcnow().isoformat(),
+            "metadata": optimization_metadata
+        }
+
+        db_result = (
+            self.supabase.table("processed_images").insert(optimization_record).execute()
+        )
+
+        if not db_result.data:
             return {
                 "success": False,
-                "error": str(e)
+                "error": "Failed to save optimization record to database"
             }
 
+        optimization_id = db_result.data[0]["id"]
+
+        return {
+            "success": True,
+            "optimization_id": optimization_id,
+            "storage_path": upload_result["storage_path"],
+            "public_url": upload_result["public_url"],
+            "persistent": True
+        }
+
     def get_user_images(self, limit: int = 50, offset: int = 0) -> dict[str, Any]:
         """
         Get user's uploaded images with pagination.
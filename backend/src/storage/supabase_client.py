@@ -100,16 +100,39 @@ class SupabaseStorage:
             user_id: User ID for organizing files
             filename: Desired filename in storage
             
+        Returns:
+            Dictionary with upload result and metadata
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+        return self.upload_original_image_bytes(data, user_id, filename)
+
+    def upload_original_image_bytes(self, data: bytes, user_id: str,
+                                    filename: str) -> dict[str, Any]:
+        """
+        Upload in-memory original image data to Supabase Storage.
+
+        Args:
+            data: Encoded image bytes
+            user_id: User ID for organizing files
+            filename: Desired filename in storage
+
         Returns:
             Dictionary with upload result and metadata
         """
         try:
             storage_path = f"{user_id}/{filename}"
 
-            with open(file_path, 'rb') as f:
-                response = self.client.storage.from_(self.originals_bucket).upload(
-                    storage_path, f.read()
-                )
+            response = self.client.storage.from_(self.originals_bucket).upload(
+                storage_path, data
+            )
 
             if response.status_code == 200:
                 # Get public URL
@@ -144,6 +167,31 @@ class SupabaseStorage:
             filename: Base filename
             preset: Optimization preset used
             
+        Returns:
+            Dictionary with upload result and metadata
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+        return self.upload_optimized_image_bytes(data, user_id, filename, preset)
+
+    def upload_optimized_image_bytes(self, data: bytes, user_id: str, filename: str,
+                                   preset: str) -> dict[str, Any]:
+        """
+        Upload in-memory optimized image data to Supabase Storage.
+
+        Args:
+            data: Encoded image bytes
+            user_id: User ID for organizing files
+            filename: Base filename
+            preset: Optimization preset used
+
         Returns:
             Dictionary with upload result and metadata
         """
@@ -154,10 +202,9 @@ class SupabaseStorage:
             storage_filename = f"{base_name}_{preset}.{extension}"
             storage_path = f"{user_id}/{storage_filename}"
 
-            with open(file_path, 'rb') as f:
-                response = self.client.storage.from_(self.optimized_bucket).upload(
-                    storage_path, f.read()
-                )
+            response = self.client.storage.from_(self.optimized_bucket).upload(
+                storage_path, data
+            )
 
             if response.status_code == 200:
                 # Get public URL